@@ -0,0 +1,281 @@
+"""
+Benchmarks reprodutíveis para GrafoDenso, GrafoEsparso, GrafoEsparsoCSR e
+kruskal().
+
+Os grafos são gerados com uma semente fixa em várias escalas (número de
+arestas) e cada operação é medida em tempo (time.perf_counter, repetida
+várias vezes com o coletor de lixo desligado; vale o menor tempo) e pico
+de memória (tracemalloc). Os valores memorizados pelos grafos são
+descartados antes de cada repetição, para que toda medição seja de uma
+chamada fria. Os resultados são gravados em JSON e podem ser comparados
+com uma execução anterior para detectar regressões.
+
+Exemplos:
+    python benchmarks/bench_grafos.py --arestas 1000 10000 --saida base.json
+    python benchmarks/bench_grafos.py --arestas 1000 10000 --comparar base.json
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "src", "kruskal"))
+
+from turma_m import GrafoAdaptativo, GrafoDenso, GrafoEsparso, GrafoEsparsoCSR  # noqa: E402
+from kruskal import GrafoEsparsoPonderado, kruskal  # noqa: E402
+
+CLASSES = {
+    "GrafoDenso": GrafoDenso,
+    "GrafoEsparso": GrafoEsparso,
+    "GrafoEsparsoCSR": GrafoEsparsoCSR,
+    "GrafoAdaptativo": GrafoAdaptativo,
+}
+
+# Densidade alvo dos grafos densos: arestas / (n * (n - 1) / 2)
+DENSIDADE_DENSO = 0.1
+# Grau médio alvo dos grafos esparsos
+GRAU_MEDIO_ESPARSO = 10
+
+
+def numero_de_vertices(classe, arestas):
+    if classe == "GrafoDenso":
+        return max(2, int((2 * arestas / DENSIDADE_DENSO) ** 0.5) + 1)
+    return max(2, 2 * arestas // GRAU_MEDIO_ESPARSO)
+
+
+def gerar_arestas(n, m, semente):
+    """Gera m arestas distintas e sem laços entre n vértices."""
+    rng = random.Random(semente)
+    vistas = set()
+    while len(vistas) < m:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v:
+            vistas.add((u, v) if u < v else (v, u))
+    arestas = sorted(vistas)
+    rng.shuffle(arestas)
+    return [(str(u), str(v)) for u, v in arestas]
+
+
+# Número mínimo de repetições de cada medição (definido por --repeticoes).
+# Operações rápidas são repetidas até somarem TEMPO_MINIMO segundos (no
+# máximo MAX_REPETICOES vezes), para que o menor tempo não dependa de um
+# instante ruidoso da máquina.
+REPETICOES = 5
+TEMPO_MINIMO = 0.2
+MAX_REPETICOES = 200
+
+
+def esfriar(*grafos):
+    """Descarta os valores memorizados dos grafos, para medir a chamada fria."""
+    for grafo in grafos:
+        # GrafoAdaptativo guarda o cache na representação interna
+        getattr(grafo, '_grafo', grafo)._cache.clear()
+
+
+def medir(funcao, memoria=True, preparar=None):
+    """
+    Executa 'funcao' repetidas vezes (ver REPETICOES) e retorna (resultado,
+    menor tempo em segundos, pico de memória em bytes). O menor tempo é a
+    estimativa menos sujeita a ruído (interrupções, outros processos). O
+    pico é medido em uma execução extra, sob tracemalloc. 'preparar' é
+    chamado antes de cada execução, exceto a primeira: para operações que
+    alteram o grafo ele desfaz a alteração; para consultas, descarta os
+    valores memorizados.
+    """
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        tempos = []
+        while len(tempos) < REPETICOES or (sum(tempos) < TEMPO_MINIMO and len(tempos) < MAX_REPETICOES):
+            if tempos and preparar is not None:
+                preparar()
+            # Como no timeit, o coletor de lixo fica desligado durante a medição
+            gc.collect()
+            gc.disable()
+            try:
+                inicio = time.perf_counter()
+                resultado = funcao()
+                tempos.append(time.perf_counter() - inicio)
+            finally:
+                gc.enable()
+        segundos = min(tempos)
+
+        pico = None
+        if memoria:
+            if preparar is not None:
+                preparar()
+            tracemalloc.start()
+            funcao()
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return resultado, segundos, pico
+
+
+def construir(classe, n, arestas):
+    grafo = CLASSES[classe](num_vertices=n)
+    grafo.adicionar_arestas(arestas)
+    return grafo
+
+
+def permutado(classe, n, arestas, semente):
+    """Cópia do grafo com os vértices renomeados por uma permutação aleatória."""
+    rotulos = [str(i) for i in range(n)]
+    random.Random(semente).shuffle(rotulos)
+    return construir(classe, n, [(rotulos[int(u)], rotulos[int(v)]) for u, v in arestas])
+
+
+def bench_classe(classe, m, semente, memoria, registrar):
+    n = numero_de_vertices(classe, m)
+    arestas = gerar_arestas(n, m, semente)
+    amostra = arestas[:min(1000, m)]
+
+    grafo = construir(classe, n, arestas)
+    _, segundos, pico = medir(lambda: construir(classe, n, arestas), memoria)
+    registrar(classe, n, m, "construcao", segundos, pico)
+
+    # Mutações individuais (tempo por aresta): a amostra é removida e depois recolocada
+    def remover():
+        for u, v in amostra:
+            grafo.remover_aresta(u, v)
+
+    def adicionar():
+        for u, v in amostra:
+            grafo.adicionar_aresta(u, v)
+
+    _, segundos, pico = medir(remover, memoria, preparar=adicionar)
+    registrar(classe, n, m, "remover_aresta", segundos / len(amostra), pico)
+    _, segundos, pico = medir(adicionar, memoria, preparar=remover)
+    registrar(classe, n, m, "adicionar_aresta", segundos / len(amostra), pico)
+
+    limpar = lambda: esfriar(grafo)
+    for nome in ("numero_de_vertices", "numero_de_arestas", "sequencia_de_graus", "is_simples",
+                 "is_nulo", "is_completo", "get_vertices", "get_arestas"):
+        limpar()
+        _, segundos, pico = medir(getattr(grafo, nome), memoria, preparar=limpar)
+        registrar(classe, n, m, nome, segundos, pico)
+
+    # Subgrafo: metade das arestas sobre os mesmos vértices. O cache dos dois
+    # grafos é descartado antes de cada medição, para nenhuma reaproveitar
+    # invariantes memorizados pela anterior.
+    sub = construir(classe, n, arestas[:m // 2])
+    limpar = lambda: esfriar(sub, grafo)
+    for nome in ("is_subgrafo", "is_subgrafo_gerador", "is_subgrafo_induzido"):
+        limpar()
+        _, segundos, pico = medir(lambda: getattr(sub, nome)(grafo), memoria, preparar=limpar)
+        registrar(classe, n, m, nome, segundos, pico)
+
+    copia = permutado(classe, n, arestas, semente + 1)
+    limpar = lambda: esfriar(grafo, copia)
+    limpar()
+    _, segundos, pico = medir(lambda: grafo.is_isomorfo(copia), memoria, preparar=limpar)
+    registrar(classe, n, m, "is_isomorfo", segundos, pico)
+
+
+def bench_kruskal(m, semente, memoria, registrar):
+    n = numero_de_vertices("GrafoEsparso", m)
+    rng = random.Random(semente)
+    arestas = [(u, v, rng.randint(1, 1000)) for u, v in gerar_arestas(n, m, semente)]
+
+    def construir_ponderado():
+        grafo = GrafoEsparsoPonderado(num_vertices=n)
+        grafo.adicionar_arestas(arestas)
+        return grafo
+
+    grafo, segundos, pico = medir(construir_ponderado, memoria)
+    registrar("GrafoEsparsoPonderado", n, m, "construcao", segundos, pico)
+    _, segundos, pico = medir(lambda: kruskal(grafo), memoria)
+    registrar("GrafoEsparsoPonderado", n, m, "kruskal", segundos, pico)
+
+
+def comparar(resultados, caminho_anterior, tolerancia, minimo):
+    """
+    Compara com uma execução anterior. Retorna a lista de regressões
+    (operações que ficaram mais lentas que 1 + tolerancia vezes o tempo
+    anterior). Operações abaixo de 'minimo' segundos são ignoradas, pois
+    nessa faixa a medição é dominada por ruído.
+    """
+    with open(caminho_anterior) as arquivo:
+        anterior = json.load(arquivo)
+    chave = lambda r: (r["classe"], r["arestas"], r["operacao"])
+    base = {chave(r): r for r in anterior["resultados"]}
+
+    regressoes = []
+    for r in resultados:
+        antigo = base.get(chave(r))
+        if antigo is None or max(antigo["segundos"], r["segundos"]) < minimo:
+            continue
+        razao = r["segundos"] / antigo["segundos"]
+        if razao > 1 + tolerancia:
+            regressoes.append((chave(r), antigo["segundos"], r["segundos"], razao))
+    return regressoes
+
+
+def main(argv=None):
+    global REPETICOES
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--arestas", type=int, nargs="+", default=[1000],
+                        help="escalas, em número de arestas (ex.: 1000 10000 ... 10000000)")
+    parser.add_argument("--classes", nargs="+", default=list(CLASSES) + ["kruskal"],
+                        choices=list(CLASSES) + ["kruskal"])
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="não mede o pico de memória (evita repetir cada operação)")
+    parser.add_argument("--saida", default="bench_resultados.json")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="aumento relativo de tempo tolerado na comparação")
+    parser.add_argument("--minimo", type=float, default=1e-2,
+                        help="tempo (s) abaixo do qual a comparação ignora a operação")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES,
+                        help="mínimo de execuções de cada operação (vale o menor tempo)")
+    args = parser.parse_args(argv)
+    REPETICOES = max(1, args.repeticoes)
+
+    memoria = not args.sem_memoria
+    resultados = []
+
+    def registrar(classe, n, m, operacao, segundos, pico):
+        resultados.append({"classe": classe, "vertices": n, "arestas": m, "operacao": operacao,
+                           "segundos": segundos, "pico_bytes": pico})
+        pico_txt = "-" if pico is None else f"{pico / 2**20:.2f} MiB"
+        print(f"{classe:22} m={m:<9} {operacao:22} {segundos:12.6f} s  {pico_txt}", flush=True)
+
+    for m in args.arestas:
+        for classe in args.classes:
+            if classe == "kruskal":
+                bench_kruskal(m, args.semente, memoria, registrar)
+            else:
+                bench_classe(classe, m, args.semente, memoria, registrar)
+
+    saida = {
+        "metadados": {
+            "data": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version,
+            "plataforma": platform.platform(),
+            "semente": args.semente,
+            "arestas": args.arestas,
+        },
+        "resultados": resultados,
+    }
+    with open(args.saida, "w") as arquivo:
+        json.dump(saida, arquivo, indent=2)
+    print(f"\nResultados gravados em {args.saida}")
+
+    if args.comparar:
+        regressoes = comparar(resultados, args.comparar, args.tolerancia, args.minimo)
+        for (classe, m, operacao), antes, agora, razao in regressoes:
+            print(f"REGRESSÃO {classe} m={m} {operacao}: {antes:.6f} s -> {agora:.6f} s ({razao:.2f}x)")
+        if regressoes:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+Estruturas compartilhadas por turma_m.py e src/kruskal/kruskal.py: as
+funções de instrumentação (stats/zerar_stats), a tabela de rótulos
+(internação dos rótulos dos vértices), a busca-união sobre índices e o
+formato binário em disco dos grafos.
+
+Os dois módulos não dependem um do outro; ambos importam este, para que
+exista uma única definição de cada estrutura.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+
+# Instrumentação
+#
+# Cada módulo tem o seu Counter 'contadores' (e, no turma_m.py, os tempos
+# por método) e expõe stats() e zerar_stats() criados por funcoes_de_stats,
+# de modo que os dois oferecem a mesma API e o mesmo formato de retrato
+# (o src/matriz.py, independente, repete esse formato).
+def funcoes_de_stats(contadores, tempos=None):
+    """
+    Retorna (stats, zerar_stats) para um Counter de contagens por operação
+    e, opcionalmente, um dicionário de tempos {nome: [chamadas, segundos]}.
+    """
+    tempos = {} if tempos is None else tempos
+
+    def stats():
+        """Retrato (cópia) das contagens por operação e dos tempos acumulados."""
+        return {
+            'contadores': dict(contadores),
+            'tempos': {nome: {'chamadas': chamadas, 'segundos': segundos}
+                       for nome, (chamadas, segundos) in tempos.items()},
+        }
+
+    def zerar_stats():
+        """Zera as contagens e os tempos acumulados."""
+        contadores.clear()
+        tempos.clear()
+
+    return stats, zerar_stats
+
+
+# Formato binário em disco
+#
+# Layout (little-endian), com todas as seções alinhadas a 8 bytes:
+#   cabeçalho  : assinatura (8 bytes), tipo (uint32), flags (uint32),
+#                n (int64), tamanho de 'vizinhos' (int64),
+#                tamanho do texto dos rótulos em bytes (int64)
+#   rótulos    : n + 1 deslocamentos int64 + texto UTF-8 concatenado
+#   offsets    : n + 1 valores int64 (formato CSR)
+#   vizinhos   : int64, cada aresta aparece nas linhas dos dois extremos
+#   pesos      : float64 ou int64 paralelos a 'vizinhos' (se indicado nas flags)
+ASSINATURA = b'GRAFOS01'
+CABECALHO = struct.Struct('<8sIIqqq')
+TIPOS_BINARIOS = {'GrafoEsparso': 0, 'GrafoDenso': 1, 'GrafoEsparsoCSR': 2, 'GrafoEsparsoPonderado': 3}
+FLAG_PESOS_REAIS = 1
+FLAG_PESOS_INTEIROS = 2
+
+
+def alinhar(tamanho):
+    return (tamanho + 7) & ~7
+
+
+def escrever_binario(caminho, tipo, rotulos, offsets, vizinhos, pesos=None):
+    """Grava um grafo em formato CSR no layout binário descrito acima."""
+    textos = []
+    posicoes = array('q', [0])
+    for rotulo in rotulos:
+        if not isinstance(rotulo, str):
+            raise TypeError(f"Rótulo '{rotulo}' não é uma string.")
+        texto = rotulo.encode('utf-8')
+        textos.append(texto)
+        posicoes.append(posicoes[-1] + len(texto))
+    texto = b''.join(textos)
+
+    flags = 0
+    if pesos is not None:
+        if all(isinstance(p, int) for p in pesos):
+            flags, pesos = FLAG_PESOS_INTEIROS, array('q', pesos)
+        else:
+            flags, pesos = FLAG_PESOS_REAIS, array('d', pesos)
+
+    # Os vetores podem ser memoryviews sobre o próprio 'caminho' mapeado em
+    # memória (carregar com mmap=True): truncá-lo antes de lê-los derruba o
+    # processo. O arquivo é gravado ao lado e só então substitui o original.
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    descritor, temporario = tempfile.mkstemp(dir=diretorio, suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(CABECALHO.pack(ASSINATURA, TIPOS_BINARIOS[tipo], flags,
+                                          len(rotulos), len(vizinhos), len(texto)))
+            arquivo.write(posicoes.tobytes())
+            arquivo.write(texto + bytes(alinhar(len(texto)) - len(texto)))
+            arquivo.write(array('q', offsets).tobytes())
+            arquivo.write(array('q', vizinhos).tobytes())
+            if pesos is not None:
+                arquivo.write(pesos.tobytes())
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+def ler_binario(caminho, usar_mmap=True):
+    """
+    Lê um arquivo gravado por escrever_binario. Retorna o dicionário
+    {'tipo', 'rotulos', 'offsets', 'vizinhos', 'pesos', 'mapa'}.
+
+    Com usar_mmap=True os vetores são memoryviews sobre o arquivo mapeado em
+    memória (sem cópia, e compartilhados entre processos que abrirem o mesmo
+    arquivo); 'mapa' guarda o mmap, que precisa continuar vivo.
+    """
+    with open(caminho, 'rb') as arquivo:
+        if usar_mmap:
+            dados = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            dados = arquivo.read()
+    visao = memoryview(dados)
+
+    assinatura, tipo, flags, n, tamanho, tamanho_texto = CABECALHO.unpack_from(visao, 0)
+    if assinatura != ASSINATURA:
+        raise ValueError(f"Arquivo '{caminho}' não está no formato binário de grafos.")
+
+    pos = CABECALHO.size
+    posicoes = visao[pos:pos + 8 * (n + 1)].cast('q')
+    pos += 8 * (n + 1)
+    texto = bytes(visao[pos:pos + tamanho_texto])
+    rotulos = [texto[posicoes[i]:posicoes[i + 1]].decode('utf-8') for i in range(n)]
+    pos += alinhar(tamanho_texto)
+
+    offsets = visao[pos:pos + 8 * (n + 1)].cast('q')
+    pos += 8 * (n + 1)
+    vizinhos = visao[pos:pos + 8 * tamanho].cast('q')
+    pos += 8 * tamanho
+
+    pesos = None
+    if flags & FLAG_PESOS_REAIS:
+        pesos = visao[pos:pos + 8 * tamanho].cast('d')
+    elif flags & FLAG_PESOS_INTEIROS:
+        pesos = visao[pos:pos + 8 * tamanho].cast('q')
+
+    if not usar_mmap:
+        offsets, vizinhos = array('q', offsets), array('q', vizinhos)
+        if pesos is not None:
+            pesos = array(pesos.format, pesos)
+        dados = None
+
+    tipos = {codigo: nome for nome, codigo in TIPOS_BINARIOS.items()}
+    return {'tipo': tipos.get(tipo), 'rotulos': rotulos, 'offsets': offsets,
+            'vizinhos': vizinhos, 'pesos': pesos, 'mapa': dados}
+
+
+class TabelaDeRotulos:
+    """
+    Internação de rótulos: cada rótulo recebe uma única vez um inteiro denso
+    (0, 1, 2, ... na ordem de chegada). As representações guardam e
+    processam apenas esses inteiros; os rótulos só são traduzidos na
+    entrada e na saída dos métodos públicos.
+    """
+    __slots__ = ('rotulos', 'indices')
+
+    def __init__(self, rotulos=()):
+        self.rotulos = []
+        self.indices = {}
+        for rotulo in rotulos:
+            self.internar(rotulo)
+
+    def internar(self, rotulo):
+        """Retorna o inteiro do rótulo, criando um novo se ele ainda não existir."""
+        indice = self.indices.get(rotulo)
+        if indice is None:
+            indice = self.indices[rotulo] = len(self.rotulos)
+            self.rotulos.append(rotulo)
+        return indice
+
+    def indice(self, rotulo):
+        """Inteiro de um rótulo já internado; ValueError se ele não existir."""
+        try:
+            return self.indices[rotulo]
+        except (KeyError, TypeError):
+            raise ValueError(f"Vértice '{rotulo}' não existe no grafo.") from None
+
+    def __getitem__(self, indice):
+        return self.rotulos[indice]
+
+    def __len__(self):
+        return len(self.rotulos)
+
+    def __contains__(self, rotulo):
+        return rotulo in self.indices
+
+    def __iter__(self):
+        return iter(self.rotulos)
+
+
+class UniaoBusca:
+    """
+    Busca-união sobre os índices 0..n-1, com compressão de caminho e união
+    por posto, contando quantos conjuntos existem.
+    """
+    __slots__ = ('pai', 'posto', 'componentes')
+
+    def __init__(self, n):
+        self.pai = array('q', range(n))
+        self.posto = bytearray(n)
+        self.componentes = n
+
+    def buscar(self, i):
+        """Raiz do conjunto de i; na volta, o caminho passa a apontar direto para ela."""
+        pai = self.pai
+        raiz = i
+        while pai[raiz] != raiz:
+            raiz = pai[raiz]
+        while pai[i] != raiz:
+            pai[i], i = raiz, pai[i]
+        return raiz
+
+    def unir(self, i, j):
+        """Une os conjuntos de i e j. Retorna False se já estavam juntos."""
+        raiz_i, raiz_j = self.buscar(i), self.buscar(j)
+        if raiz_i == raiz_j:
+            return False
+        if self.posto[raiz_i] < self.posto[raiz_j]:
+            raiz_i, raiz_j = raiz_j, raiz_i
+        self.pai[raiz_j] = raiz_i
+        if self.posto[raiz_i] == self.posto[raiz_j]:
+            self.posto[raiz_i] += 1
+        self.componentes -= 1
+        return True
@@ -0,0 +1,523 @@
+"""
+Servidor assíncrono (asyncio) que hospeda um grafo em memória e atende
+consultas em JSON delimitado por linhas (NDJSON) por um socket TCP local ou
+Unix, para que vários processos compartilhem a mesma cópia do grafo.
+
+Cada pedido é um objeto JSON em uma linha:
+    {"id": 1, "op": "adicionar_aresta", "args": ["A", "B"]}
+e cada resposta traz o mesmo "id":
+    {"id": 1, "ok": true, "resultado": null}
+    {"id": 1, "ok": false, "erro": "Vértice 'Z' não existe no grafo."}
+
+Uma conexão pode enviar vários pedidos sem esperar as respostas; elas
+chegam na ordem em que ficam prontas, identificadas pelo "id".
+
+Operações:
+    mutações    adicionar_aresta(u, v), remover_aresta(u, v),
+                adicionar_arestas([[u, v], ...]), remover_arestas([[u, v], ...])
+    invariantes numero_de_vertices, numero_de_arestas, sequencia_de_graus,
+                is_simples, is_nulo, is_completo, get_vertices, get_arestas,
+                hash_invariante, is_conexo, numero_de_componentes,
+                mesma_componente(u, v), stats
+    pesadas     is_subgrafo(g), is_subgrafo_gerador(g), is_subgrafo_induzido(g),
+                is_isomorfo(g), hash_canonico, kruskal
+onde g é um grafo no formato {"vertices": [...], "arestas": [[u, v], ...]}.
+is_subgrafo* verificam se g é subgrafo do grafo hospedado; kruskal devolve
+uma floresta geradora mínima considerando todas as arestas com peso 1.
+
+As mutações que chegam ao mesmo tempo (de uma ou várias conexões) são
+agrupadas em lotes e aplicadas com adicionar_arestas/remover_arestas. Para
+que o laço de eventos continue atendendo os demais pedidos, nada que custe
+O(V + E) roda nele: get_arestas, is_conexo, numero_de_componentes e
+mesma_componente são lidos em uma thread a partir de um snapshot() do grafo,
+e as consultas pesadas rodam em um pool de processos sobre uma cópia
+serializada (também em uma thread) a partir do mesmo snapshot.
+
+Exemplos:
+    python servidor_grafos.py servir --vertices 10000 --porta 8765
+    python servidor_grafos.py carga --porta 8765 --conexoes 16 --pedidos 20000
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import pickle
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(RAIZ, "src", "kruskal"))
+
+import turma_m  # noqa: E402
+from turma_m import GrafoEsparso, contadores  # noqa: E402
+from kruskal import GrafoEsparsoPonderado, kruskal  # noqa: E402
+
+log = logging.getLogger("grafos.servidor")
+log.addHandler(logging.NullHandler())
+
+MUTACOES = {'adicionar_aresta', 'remover_aresta', 'adicionar_arestas', 'remover_arestas'}
+LEITURAS = {'numero_de_vertices', 'numero_de_arestas', 'sequencia_de_graus', 'is_simples',
+            'is_nulo', 'is_completo', 'get_vertices', 'hash_invariante'}
+# Leituras O(V + E): feitas em uma thread sobre um snapshot do grafo
+PERCURSOS = {'get_arestas', 'is_conexo', 'numero_de_componentes', 'mesma_componente'}
+PESADAS = {'is_subgrafo', 'is_subgrafo_gerador', 'is_subgrafo_induzido', 'is_isomorfo',
+           'hash_canonico', 'kruskal'}
+
+# Tamanho máximo de uma linha (pedido ou resposta) lida do socket
+LIMITE_LINHA = 2**26
+# Resultados com mais itens que isto são convertidos em JSON fora do laço
+LIMITE_JSON_NO_LACO = 1000
+
+
+class ErroDoServidor(Exception):
+    """Erro devolvido pelo servidor em resposta a um pedido."""
+
+
+# Consultas pesadas
+#
+# Executadas no processo principal (workers=0) ou nos processos do pool.
+# Cada processo guarda a última cópia reconstruída do grafo, identificada
+# pela versão do servidor, e só a reconstrói quando o grafo muda.
+_copia_do_processo = (None, None)
+
+
+def _grafo_de_json(dados):
+    """Constrói um GrafoEsparso a partir de {"vertices": [...], "arestas": [[u, v], ...]}."""
+    if not isinstance(dados, dict) or not dados.get('vertices'):
+        raise ValueError("O grafo precisa de ao menos um vértice.")
+    grafo = GrafoEsparso(labels=[str(v) for v in dados['vertices']])
+    erros = grafo.adicionar_arestas(tuple(a) for a in dados.get('arestas', ()))
+    if erros:
+        raise ValueError(erros[0][1])
+    return grafo
+
+
+def _serializar(grafo):
+    return pickle.dumps((type(grafo).__name__, list(grafo.get_vertices()),
+                         list(grafo.get_arestas())), pickle.HIGHEST_PROTOCOL)
+
+
+def _reconstruir(carga):
+    nome, vertices, arestas = pickle.loads(carga)
+    classe = getattr(turma_m, nome, GrafoEsparso)
+    # Snapshots são imutáveis: a cópia é montada na representação de origem
+    classe = next(c for c in classe.__mro__ if not issubclass(c, turma_m._Instantaneo))
+    grafo = classe(labels=vertices)
+    grafo.adicionar_arestas(arestas)
+    return grafo
+
+
+def _ler(grafo, op, args):
+    resultado = getattr(grafo, op)(*args)
+    return list(resultado) if op == 'get_arestas' else resultado
+
+
+def _consulta_pesada(grafo, op, args):
+    if op == 'kruskal':
+        ponderado = GrafoEsparsoPonderado(labels=list(grafo.get_vertices()))
+        ponderado.adicionar_arestas((u, v, 1) for u, v in grafo.get_arestas())
+        return kruskal(ponderado)
+    if op == 'hash_canonico':
+        return grafo.hash_canonico()
+    outro = _grafo_de_json(args[0])
+    if op == 'is_isomorfo':
+        return grafo.is_isomorfo(outro)
+    return getattr(outro, op)(grafo)
+
+
+def _consulta_no_processo(chave, carga, op, args):
+    global _copia_do_processo
+    if _copia_do_processo[0] != chave:
+        _copia_do_processo = (chave, _reconstruir(carga))
+    return _consulta_pesada(_copia_do_processo[1], op, args)
+
+
+class ServidorDeGrafos:
+    """
+    Hospeda 'grafo' (qualquer instância de Grafo) e atende pedidos NDJSON.
+    'workers' é o tamanho do pool de processos das consultas pesadas (0 as
+    executa no próprio laço de eventos) e 'max_lote' o número máximo de
+    pedidos de mutação aplicados de uma vez.
+    """
+
+    def __init__(self, grafo, workers=2, max_lote=4096):
+        self.grafo = grafo
+        self.workers = workers
+        self.max_lote = max_lote
+        self._fila = None
+        self._aplicador = None
+        self._pool = None
+        self._servidor = None
+        self._conexoes = set()
+        # Versão do grafo vista pelo servidor, com o snapshot e a cópia
+        # serializada (um futuro) correspondentes
+        self._versao = 0
+        self._instantaneo = (None, None)
+        self._carga = (None, None)
+
+    async def iniciar(self, host='127.0.0.1', porta=0, caminho_unix=None):
+        """
+        Começa a aceitar conexões em host:porta (porta 0 escolhe uma livre)
+        ou, se 'caminho_unix' for dado, no socket Unix desse caminho.
+        Retorna o endereço em que o servidor está escutando.
+        """
+        self._fila = asyncio.Queue()
+        self._aplicador = asyncio.create_task(self._aplicar_mutacoes())
+        if self.workers > 0:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        if caminho_unix is not None:
+            self._servidor = await asyncio.start_unix_server(self._atender, caminho_unix, limit=LIMITE_LINHA)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, porta, limit=LIMITE_LINHA)
+        endereco = self._servidor.sockets[0].getsockname()
+        log.info("servidor escutando em %s", endereco)
+        return endereco
+
+    async def servir(self):
+        """Atende conexões até o servidor ser encerrado."""
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def encerrar(self):
+        self._servidor.close()
+        for tarefa in self._conexoes:
+            tarefa.cancel()
+        await asyncio.gather(*self._conexoes, return_exceptions=True)
+        await self._servidor.wait_closed()
+        self._aplicador.cancel()
+        try:
+            await self._aplicador
+        except asyncio.CancelledError:
+            pass
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    async def _atender(self, leitor, escritor):
+        conexao = asyncio.current_task()
+        self._conexoes.add(conexao)
+        pendentes = set()
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                tarefa = asyncio.create_task(self._responder(linha, escritor))
+                pendentes.add(tarefa)
+                tarefa.add_done_callback(pendentes.discard)
+            if pendentes:
+                await asyncio.gather(*pendentes)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            log.warning("conexão encerrada: %s", e)
+        except asyncio.CancelledError:
+            # Servidor encerrado com a conexão ainda aberta
+            for tarefa in pendentes:
+                tarefa.cancel()
+        finally:
+            self._conexoes.discard(conexao)
+            escritor.close()
+
+    async def _responder(self, linha, escritor):
+        id_pedido = None
+        try:
+            pedido = json.loads(linha)
+            id_pedido = pedido.get('id')
+            resultado = await self._executar(pedido.get('op'), pedido.get('args', []))
+            resposta = {'id': id_pedido, 'ok': True, 'resultado': resultado}
+        except Exception as e:
+            resposta = {'id': id_pedido, 'ok': False, 'erro': str(e)}
+        if isinstance(resposta.get('resultado'), list) and len(resposta['resultado']) > LIMITE_JSON_NO_LACO:
+            dados = await asyncio.get_running_loop().run_in_executor(None, json.dumps, resposta)
+        else:
+            dados = json.dumps(resposta)
+        if escritor.is_closing():
+            return
+        escritor.write(dados.encode() + b'\n')
+        await escritor.drain()
+
+    async def _executar(self, op, args):
+        contadores['servidor_pedidos'] += 1
+        if op in MUTACOES:
+            futuro = asyncio.get_running_loop().create_future()
+            self._fila.put_nowait((op, args, futuro))
+            return await futuro
+        if op in LEITURAS:
+            return getattr(self.grafo, op)(*args)
+        if op in PERCURSOS:
+            grafo = self._snapshot_atual()
+            if grafo is None:
+                return _ler(self.grafo, op, args)
+            return await asyncio.get_running_loop().run_in_executor(None, _ler, grafo, op, args)
+        if op in PESADAS:
+            if self._pool is None:
+                return _consulta_pesada(self.grafo, op, args)
+            chave, carga = await self._carga_atual()
+            return await asyncio.get_running_loop().run_in_executor(
+                self._pool, _consulta_no_processo, chave, carga, op, args)
+        if op == 'stats':
+            return turma_m.stats()
+        raise ValueError(f"Operação desconhecida: {op!r}")
+
+    def _snapshot_atual(self):
+        """
+        Snapshot do grafo na versão atual, que threads podem ler enquanto o
+        laço continua aplicando mutações; None se a representação não
+        oferece snapshot(). É refeito (em O(V)) só depois de uma mutação.
+        """
+        if self._instantaneo[0] != self._versao:
+            snapshot = getattr(self.grafo, 'snapshot', None)
+            self._instantaneo = (self._versao, snapshot() if snapshot is not None else None)
+        return self._instantaneo[1]
+
+    async def _carga_atual(self):
+        """
+        Cópia serializada do grafo, refeita apenas quando o grafo muda. A
+        serialização é feita em uma thread a partir do snapshot; pedidos
+        simultâneos esperam pelo mesmo futuro.
+        """
+        versao = self._versao
+        if self._carga[0] != versao:
+            grafo = self._snapshot_atual()
+            if grafo is None:
+                futuro = asyncio.get_running_loop().create_future()
+                futuro.set_result(_serializar(self.grafo))
+            else:
+                futuro = asyncio.get_running_loop().run_in_executor(None, _serializar, grafo)
+            self._carga = (versao, futuro)
+        carga = await self._carga[1]
+        return (os.getpid(), id(self), versao), carga
+
+    # Agrupamento das mutações
+    async def _aplicar_mutacoes(self):
+        """
+        Tarefa única que aplica as mutações: espera o primeiro pedido e junta
+        a ele todos os que já estão na fila, até max_lote.
+        """
+        fila = self._fila
+        while True:
+            lote = [await fila.get()]
+            while len(lote) < self.max_lote and not fila.empty():
+                lote.append(fila.get_nowait())
+            # Pedidos consecutivos do mesmo tipo viram uma só chamada em lote
+            for remocao, grupo in itertools.groupby(lote, key=lambda p: p[0].startswith('remover')):
+                grupo = list(grupo)
+                try:
+                    self._aplicar_grupo(remocao, grupo)
+                except Exception as e:
+                    # Um grafo que não aceita alterações (um snapshot, por
+                    # exemplo) não pode derrubar a tarefa: o erro vai para os
+                    # pedidos do grupo e os próximos lotes seguem normalmente
+                    log.error("erro ao aplicar lote de mutações: %s", e)
+                    # O lote pode ter sido aplicado em parte
+                    self._versao += 1
+                    for _, _, futuro in grupo:
+                        if not futuro.done():
+                            futuro.set_exception(e)
+
+    def _aplicar_grupo(self, remocao, grupo):
+        contadores['servidor_lotes'] += 1
+        contadores['servidor_mutacoes'] += len(grupo)
+        arestas = []
+        # Fatia [inicio, fim) de 'arestas' com os pares de cada pedido
+        limites = []
+        for op, args, futuro in grupo:
+            try:
+                pares = [tuple(args)] if op in ('adicionar_aresta', 'remover_aresta') else [tuple(a) for a in args[0]]
+            except (TypeError, IndexError):
+                futuro.set_exception(ValueError(f"Argumentos inválidos para {op}."))
+                pares = []
+            limites.append((len(arestas), len(arestas) + len(pares)))
+            arestas.extend(pares)
+
+        operacao = self.grafo.remover_arestas if remocao else self.grafo.adicionar_arestas
+        erros = operacao(arestas)
+        if len(erros) < len(arestas):
+            self._versao += 1
+
+        # Os erros vêm na ordem das arestas e trazem o próprio objeto
+        # recebido: cada um é localizado avançando sobre 'arestas' e vai para
+        # o pedido cuja fatia contém essa posição. Objetos iguais podem se
+        # repetir (tuple([]) é sempre o mesmo ()), por isso a busca não volta.
+        por_pedido = {}
+        k = pedido = 0
+        for aresta, mensagem in erros:
+            while arestas[k] is not aresta:
+                k += 1
+            while k >= limites[pedido][1]:
+                pedido += 1
+            por_pedido.setdefault(pedido, []).append((aresta, mensagem))
+            k += 1
+        for posicao, (op, args, futuro) in enumerate(grupo):
+            if futuro.done():
+                continue
+            erros_pedido = por_pedido.get(posicao, [])
+            if op.endswith('arestas'):
+                futuro.set_result(erros_pedido)
+            elif erros_pedido:
+                futuro.set_exception(ValueError(erros_pedido[0][1]))
+            else:
+                futuro.set_result(None)
+        log.debug("lote de %d pedidos, %d arestas", len(grupo), len(arestas))
+
+
+class ClienteDeGrafos:
+    """
+    Cliente assíncrono do ServidorDeGrafos. Vários pedidos podem estar em
+    andamento ao mesmo tempo na mesma conexão.
+    """
+
+    def __init__(self, leitor, escritor):
+        self._leitor = leitor
+        self._escritor = escritor
+        self._ids = itertools.count(1)
+        self._pendentes = {}
+        self._recebedor = asyncio.create_task(self._receber())
+
+    @classmethod
+    async def conectar(cls, host='127.0.0.1', porta=8765, caminho_unix=None):
+        if caminho_unix is not None:
+            leitor, escritor = await asyncio.open_unix_connection(caminho_unix, limit=LIMITE_LINHA)
+        else:
+            leitor, escritor = await asyncio.open_connection(host, porta, limit=LIMITE_LINHA)
+        return cls(leitor, escritor)
+
+    async def chamar(self, op, *args):
+        """Envia o pedido 'op' e retorna o resultado; lança ErroDoServidor em caso de erro."""
+        id_pedido = next(self._ids)
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendentes[id_pedido] = futuro
+        self._escritor.write(json.dumps({'id': id_pedido, 'op': op, 'args': args}).encode() + b'\n')
+        await self._escritor.drain()
+        return await futuro
+
+    async def _receber(self):
+        try:
+            while True:
+                linha = await self._leitor.readline()
+                if not linha:
+                    break
+                resposta = json.loads(linha)
+                futuro = self._pendentes.pop(resposta.get('id'), None)
+                if futuro is None or futuro.done():
+                    continue
+                if resposta.get('ok'):
+                    futuro.set_result(resposta.get('resultado'))
+                else:
+                    futuro.set_exception(ErroDoServidor(resposta.get('erro')))
+        finally:
+            for futuro in self._pendentes.values():
+                if not futuro.done():
+                    futuro.set_exception(ConnectionError("Conexão com o servidor encerrada."))
+            self._pendentes.clear()
+
+    async def fechar(self):
+        self._escritor.close()
+        await self._escritor.wait_closed()
+        self._recebedor.cancel()
+        try:
+            await self._recebedor
+        except asyncio.CancelledError:
+            pass
+
+
+async def teste_de_carga(host='127.0.0.1', porta=8765, caminho_unix=None, conexoes=8,
+                         pedidos=10000, proporcao_mutacoes=0.5, semente=42):
+    """
+    Abre 'conexoes' clientes concorrentes que enviam, juntos, 'pedidos'
+    pedidos: mutações (adicionar/remover arestas aleatórias) na proporção
+    dada e, no restante, leituras de invariantes. Retorna a vazão e as
+    latências (em segundos).
+    """
+    clientes = [await ClienteDeGrafos.conectar(host, porta, caminho_unix) for _ in range(conexoes)]
+    vertices = await clientes[0].chamar('get_vertices')
+    leituras = ['numero_de_arestas', 'sequencia_de_graus', 'is_simples', 'hash_invariante']
+    latencias = []
+    erros = 0
+
+    async def trabalhar(cliente, quantidade, rng):
+        nonlocal erros
+        for _ in range(quantidade):
+            if rng.random() < proporcao_mutacoes:
+                op = rng.choice(('adicionar_aresta', 'remover_aresta'))
+                args = (rng.choice(vertices), rng.choice(vertices))
+            else:
+                op, args = rng.choice(leituras), ()
+            inicio = time.perf_counter()
+            try:
+                await cliente.chamar(op, *args)
+            except ErroDoServidor:
+                erros += 1
+            latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    por_cliente, resto = divmod(pedidos, conexoes)
+    await asyncio.gather(*(trabalhar(cliente, por_cliente + (k < resto), random.Random(semente + k))
+                           for k, cliente in enumerate(clientes)))
+    segundos = time.perf_counter() - inicio
+    for cliente in clientes:
+        await cliente.fechar()
+
+    latencias.sort()
+    percentil = lambda p: latencias[min(len(latencias) - 1, int(p * len(latencias)))]
+    return {
+        'pedidos': len(latencias),
+        'erros': erros,
+        'segundos': segundos,
+        'pedidos_por_segundo': len(latencias) / segundos,
+        'latencia_p50': percentil(0.50),
+        'latencia_p99': percentil(0.99),
+        'latencia_max': latencias[-1],
+    }
+
+
+async def _servir(args):
+    classe = getattr(turma_m, args.classe)
+    servidor = ServidorDeGrafos(classe(num_vertices=args.vertices), workers=args.workers)
+    endereco = await servidor.iniciar(args.host, args.porta, args.unix)
+    print(f"Servindo {args.classe} com {args.vertices} vértices em {endereco}", flush=True)
+    try:
+        await servidor.servir()
+    finally:
+        await servidor.encerrar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    for nome in ("servir", "carga"):
+        sub = comandos.add_parser(nome)
+        sub.add_argument("--host", default="127.0.0.1")
+        sub.add_argument("--porta", type=int, default=8765)
+        sub.add_argument("--unix", help="caminho de um socket Unix (no lugar de host/porta)")
+        if nome == "servir":
+            sub.add_argument("--classe", default="GrafoEsparso",
+                             choices=["GrafoDenso", "GrafoDensoNumPy", "GrafoEsparso", "GrafoAdaptativo"])
+            sub.add_argument("--vertices", type=int, default=1000)
+            sub.add_argument("--workers", type=int, default=2,
+                             help="processos para as consultas pesadas (0 = no laço de eventos)")
+        else:
+            sub.add_argument("--conexoes", type=int, default=8)
+            sub.add_argument("--pedidos", type=int, default=10000)
+            sub.add_argument("--mutacoes", type=float, default=0.5,
+                             help="proporção de pedidos de mutação")
+    args = parser.parse_args(argv)
+
+    if args.comando == "servir":
+        try:
+            asyncio.run(_servir(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    resultado = asyncio.run(teste_de_carga(args.host, args.porta, args.unix, args.conexoes,
+                                           args.pedidos, args.mutacoes))
+    for nome, valor in resultado.items():
+        print(f"{nome:20} {valor}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,32 @@
 import sys
+import heapq
+import logging
+import math
+import os
+import struct
+import tempfile
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from operator import itemgetter
+
+# A instrumentação, a tabela de rótulos e o formato binário em disco (o
+# mesmo de turma_m.py, com a seção de pesos paralela a 'vizinhos') ficam em
+# grafos_comum.py, na raiz do repositório.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from grafos_comum import (TabelaDeRotulos, UniaoBusca, escrever_binario,  # noqa: E402
+                          funcoes_de_stats, ler_binario)
+
+
+# Instrumentação: mensagens no logger "grafos.kruskal" (silencioso por
+# padrão, como o "grafos" de turma_m.py) e contagens por operação em
+# 'contadores' (arestas adicionadas/removidas, chamadas de find e union).
+log = logging.getLogger("grafos.kruskal")
+log.addHandler(logging.NullHandler())
+
+contadores = Counter()
+stats, zerar_stats = funcoes_de_stats(contadores)
+
 
 class GrafoEsparsoPonderado():
     """
@@ -6,48 +34,195 @@ class GrafoEsparsoPonderado():
     usando uma LISTA DE ADJACÊNCIAS (implementada com um dicionário).
     """
     # (i) Definição do grafo
-    def __init__(self, num_vertices=None, labels=None):
+    def __init__(self, num_vertices=None, labels=None, tamanho_cache=128):
 
         if labels:
-            self.vertices = labels
+            self.tabela = TabelaDeRotulos(labels)
         elif num_vertices:
-            self.vertices = [str(i) for i in range(num_vertices)]
+            self.tabela = TabelaDeRotulos(str(i) for i in range(num_vertices))
         else:
             print("Erro: Forneça 'num_vertices' ou uma lista de 'labels'.")
             sys.exit(1)
+        self.vertices = self.tabela.rotulos
+
+        # lista_adj[i] é a lista de pares (índice do vizinho, peso) do vértice i
+        self.lista_adj = [[] for _ in self.vertices]
+
+        # Índice de arestas: multiconjunto das arestas (i, j, peso) com i <= j.
+        # Mantido junto com a lista de adjacências para consultas O(1) e
+        # get_arestas em O(E).
+        self._indice_arestas = Counter()
+        self._indice_pares = Counter()
+
+        # Cache LRU das árvores de caminhos mínimos do dijkstra(), por índice
+        # da origem; esvaziado a cada alteração do grafo
+        self.tamanho_cache = tamanho_cache
+        self._arvores = OrderedDict()
+
+    def _chave_aresta(self, i, j):
+        # Forma canônica da aresta não orientada {i, j}
+        return (i, j) if i <= j else (j, i)
+
+    def _registrar(self, i, j, peso, quantidade):
+        """Atualiza os índices de arestas somando 'quantidade' ocorrências."""
+        contadores['arestas_adicionadas' if quantidade > 0 else 'arestas_removidas'] += abs(quantidade)
+        if self._arvores:
+            self._arvores.clear()
+        par = self._chave_aresta(i, j)
+        for indice, chave in ((self._indice_arestas, par + (peso,)), (self._indice_pares, par)):
+            indice[chave] += quantidade
+            if indice[chave] <= 0:
+                del indice[chave]
 
-        self.lista_adj = {vertice: [] for vertice in self.vertices}
+    def _obter_indice(self, vertice):
+        return self.tabela.indice(vertice)
 
+    def tem_aresta(self, u, v, peso=None):
+        """Verifica em O(1) se existe aresta entre u e v (com o peso dado, se informado)."""
+        par = self._chave_aresta(self._obter_indice(u), self._obter_indice(v))
+        if peso is None:
+            return par in self._indice_pares
+        return par + (peso,) in self._indice_arestas
+
+    def _adicionar(self, i, j, peso):
+        # Pode adicionar aresta duplicada ou laço (loop)
+        self.lista_adj[i].append((j, peso))
+        self.lista_adj[j].append((i, peso))
+        self._registrar(i, j, peso, 1)
 
     # (ii) Adição de arestas
     def adicionar_aresta(self, u, v, peso=1):
         try:
-            self._validar_vertice(u)
-            self._validar_vertice(v)
+            self._adicionar(self._obter_indice(u), self._obter_indice(v), peso)
+            log.debug("Aresta adicionada entre %s e %s.", u, v)
+        except ValueError as e:
+            log.error("Erro ao adicionar aresta: %s", e)
 
-            # Pode adicionar aresta duplicada ou laço (loop)
-            self.lista_adj[u].append((v, peso))
-            self.lista_adj[v].append((u, peso))
- 
-            print(f"Aresta adicionada entre {u} e {v}")
+    def _remover(self, i, j, peso=None):
+        """
+        Remove a primeira aresta entre os índices i e j (com o peso dado, se
+        informado). Retorna o peso removido, ou None se a aresta não existir.
+        """
+        par = self._chave_aresta(i, j)
+        if par not in self._indice_pares or (peso is not None and par + (peso,) not in self._indice_arestas):
+            return None
+        for index, (vizinho, p) in enumerate(self.lista_adj[i]):
+            if vizinho == j and (peso is None or p == peso):
+                del self.lista_adj[i][index]
+                self.lista_adj[j].remove((i, p))
+                self._registrar(i, j, p, -1)
+                return p
+        return None
+
+    # (v) Remoção de arestas
+    def remover_aresta(self, u, v, peso=None):
+        """
+        Se existir mais de uma, remove a primeira aresta entre os vértices u e v.
+        """
+        try:
+            if self._remover(self._obter_indice(u), self._obter_indice(v), peso) is not None:
+                log.debug("Aresta removida entre %s e %s.", u, v)
+            else:
+                log.warning("Aresta entre %s e %s não existe.", u, v)
         except ValueError as e:
-            print(f"Erro ao adicionar aresta: {e}")
+            log.error("Erro ao remover aresta: %s", e)
+
+    def adicionar_arestas(self, arestas):
+        """
+        Adiciona várias arestas de uma vez, sem imprimir nada.
+        Aceita qualquer iterável (inclusive geradores) de tuplas (u, v)
+        ou (u, v, peso). Retorna a lista de erros no formato (aresta, mensagem).
+        """
+        erros = []
+        obter_indice = self._obter_indice
+        adicionar = self._adicionar
+        for aresta in arestas:
+            try:
+                if len(aresta) == 3:
+                    u, v, peso = aresta
+                else:
+                    u, v = aresta
+                    peso = 1
+                i, j = obter_indice(u), obter_indice(v)
+            except (ValueError, TypeError) as e:
+                erros.append((aresta, str(e)))
+                continue
+            adicionar(i, j, peso)
+        return erros
+
+    def remover_arestas(self, arestas):
+        """
+        Remove várias arestas de uma vez, sem imprimir nada.
+        Aceita tuplas (u, v) ou (u, v, peso). Retorna a lista de erros
+        no formato (aresta, mensagem).
+        """
+        erros = []
+        for aresta in arestas:
+            try:
+                if len(aresta) == 3:
+                    u, v, peso = aresta
+                else:
+                    u, v = aresta
+                    peso = None
+                if self._remover(self._obter_indice(u), self._obter_indice(v), peso) is None:
+                    erros.append((aresta, f"Aresta entre {u} e {v} não existe."))
+            except (ValueError, TypeError) as e:
+                erros.append((aresta, str(e)))
+        return erros
 
     def get_vertices(self):
-        return list(self.lista_adj.keys())
-    
+        return list(self.vertices)
+
+    def salvar(self, caminho):
+        """Grava o grafo no formato binário (cabeçalho, rótulos, offsets, vizinhos e pesos)."""
+        offsets, vizinhos, pesos = array('q', [0]), array('q'), []
+        for linha in self.lista_adj:
+            for vizinho, peso in linha:
+                vizinhos.append(vizinho)
+                pesos.append(peso)
+            offsets.append(len(vizinhos))
+        escrever_binario(caminho, 'GrafoEsparsoPonderado', self.get_vertices(), offsets, vizinhos, pesos)
+
+    @classmethod
+    def carregar(cls, caminho, mmap=True):
+        """
+        Lê um grafo gravado por salvar(). Com mmap=True o arquivo é mapeado
+        em memória e as arestas são lidas direto das páginas mapeadas.
+        Arquivos sem pesos (gravados por turma_m.py) são lidos com peso 1.
+        """
+        dados = ler_binario(caminho, usar_mmap=mmap)
+        rotulos, offsets, vizinhos, pesos = dados['rotulos'], dados['offsets'], dados['vizinhos'], dados['pesos']
+        if pesos is None:
+            pesos = [1] * len(vizinhos)
+
+        # Cada aresta é inserida uma vez, a partir do extremo de menor índice;
+        # laços aparecem duas vezes na própria linha.
+        grafo = cls(labels=rotulos)
+        adicionar = grafo._adicionar
+        for i in range(len(rotulos)):
+            lacos = 0
+            for k in range(offsets[i], offsets[i + 1]):
+                j = vizinhos[k]
+                if j > i:
+                    adicionar(i, j, pesos[k])
+                elif j == i:
+                    lacos += 1
+                    if lacos % 2 == 0:
+                        adicionar(i, i, pesos[k])
+        return grafo
+
     def get_arestas(self):
+        # Expande o índice de arestas: cada aresta aparece uma vez por
+        # ocorrência (arestas múltiplas se repetem)
         arestas = []
-        for vertice, vizinhos in self.lista_adj.items():
-            for vizinho, peso in vizinhos:
-                if (vizinho, vertice, peso) not in arestas:
-                    arestas.append((vertice, vizinho, peso))
+        rotulos = self.vertices
+        for (i, j, peso), quantidade in self._indice_arestas.items():
+            arestas.extend([(rotulos[i], rotulos[j], peso)] * quantidade)
         return arestas
     
     def _validar_vertice(self, vertice):
         """Método auxiliar para checar se um vértice existe no grafo."""
-        if vertice not in self.lista_adj:
-            raise ValueError(f"Vértice '{vertice}' não existe no grafo.")
+        self.tabela.indice(vertice)
         return True
     
     def imprimir(self):
@@ -56,94 +231,657 @@ class GrafoEsparsoPonderado():
         if not self.lista_adj:
             print("{}")
             return
-        for vertice, vizinhos in self.lista_adj.items():
+        rotulos = self.vertices
+        for i, vizinhos in enumerate(self.lista_adj):
             # Junta a lista de vizinhos em uma string para impressão
-            saida = [vizinho for vizinho in vizinhos]             
-            print(f"  {vertice} -> [ {saida} ]")
+            saida = [(rotulos[j], peso) for j, peso in vizinhos]
+            print(f"  {rotulos[i]} -> [ {saida} ]")
         print()
 
-class BuscaUniaoSimples():
+    # Caminhos mínimos
+    def _arvore_em_cache(self, origem, destino):
+        """Árvore guardada que responde à consulta (origem, destino), ou None."""
+        entrada = self._arvores.get(origem)
+        if entrada is None:
+            return None
+        arvore, completa = entrada
+        if not completa and (destino < 0 or destino not in arvore):
+            return None
+        self._arvores.move_to_end(origem)
+        contadores['dijkstra_cache'] += 1
+        return arvore
 
-    def __init__(self, vertices):
-        """
-        Cada vértice começa como seu próprio "pai" (em seu próprio conjunto).
-        """
-        self.parent = {v: v for v in vertices}
-        print(self.parent)
+    def _guardar_arvore(self, origem, arvore, completa):
+        anterior = self._arvores.get(origem)
+        if anterior is not None and anterior[1] and not completa:
+            return  # já há uma árvore completa para esta origem
+        self._arvores[origem] = (arvore, completa)
+        self._arvores.move_to_end(origem)
+        while len(self._arvores) > self.tamanho_cache:
+            self._arvores.popitem(last=False)
 
-    def find(self, v):
+    def _resposta_dijkstra(self, arvore, destino):
+        rotulos = self.vertices
+        if destino < 0:
+            distancias = {rotulos[v]: d for v, (d, _) in arvore.items()}
+            anteriores = {rotulos[v]: (rotulos[a] if a >= 0 else None) for v, (_, a) in arvore.items()}
+            return distancias, anteriores
+        if destino not in arvore:
+            return math.inf, []
+        caminho = []
+        v = destino
+        while v >= 0:
+            caminho.append(rotulos[v])
+            v = arvore[v][1]
+        caminho.reverse()
+        return arvore[destino][0], caminho
+
+    def dijkstra(self, origem, destino=None):
         """
-        Encontra a raiz do conjunto ao qual 'v' pertence.
-        Faz isso simplesmente seguindo os ponteiros de "pai" até o topo
+        Caminhos mínimos a partir de 'origem' (pesos não negativos), com um
+        heap binário. Sem destino, retorna (distancias, anteriores): dois
+        dicionários com a distância e o vértice anterior no caminho de cada
+        vértice alcançável. Com destino, a busca para assim que ele sai do
+        heap e retorna (distância, caminho), ou (inf, []) se não houver caminho.
+
+        As árvores calculadas ficam em um cache LRU de 'tamanho_cache'
+        origens, esvaziado a cada alteração do grafo.
         """
-        root = v
-        while self.parent[root] != root:
-            root = self.parent[root]
-        return root
+        i = self._obter_indice(origem)
+        j = -1 if destino is None else self._obter_indice(destino)
+        arvore = self._arvore_em_cache(i, j)
+        if arvore is None:
+            arvore, completa = _dijkstra_indices(self.lista_adj, i, j)
+            self._guardar_arvore(i, arvore, completa)
+        return self._resposta_dijkstra(arvore, j)
 
-    def union(self, u, v):
+    def dijkstra_em_lote(self, consultas, workers=1, processos=False):
         """
-        Une os conjuntos de 'u' e 'v' de forma arbitrária.
+        Responde várias consultas (origem, destino) de uma vez, com destino
+        None para a árvore inteira. As que não estão no cache são divididas
+        entre 'workers' threads ou, com processos=True, processos (o grafo é
+        enviado uma única vez para cada um). Retorna as respostas de
+        dijkstra() na ordem das consultas.
         """
-        root_u = self.find(u)
-        root_v = self.find(v)
+        obter_indice = self._obter_indice
+        pares = [(obter_indice(o), -1 if d is None else obter_indice(d)) for o, d in consultas]
 
-        # Se não estiverem no mesmo conjunto, une os dois
-        if root_u != root_v:
-            # Simplesmente faz a raiz de um apontar para a raiz do outro
-            self.parent[root_v] = root_u
-            return True
-        return False
+        arvores = [self._arvore_em_cache(i, j) for i, j in pares]
+        pendentes = list({(i, j) for (i, j), arvore in zip(pares, arvores) if arvore is None})
+        if pendentes:
+            if workers <= 1:
+                calculadas = [_dijkstra_indices(self.lista_adj, i, j) for i, j in pendentes]
+            elif processos:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_processo_dijkstra,
+                                         initargs=(self.lista_adj,)) as executor:
+                    calculadas = list(executor.map(_dijkstra_processo, pendentes,
+                                                   chunksize=max(1, len(pendentes) // (4 * workers))))
+            else:
+                lista_adj = self.lista_adj
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    calculadas = list(executor.map(lambda par: _dijkstra_indices(lista_adj, *par), pendentes))
+            # O cache só é alterado aqui, na thread que chamou
+            novas = {}
+            for (i, j), (arvore, completa) in zip(pendentes, calculadas):
+                self._guardar_arvore(i, arvore, completa)
+                novas[(i, j)] = arvore
+            arvores = [arvore if arvore is not None else novas[par] for par, arvore in zip(pares, arvores)]
+        return [self._resposta_dijkstra(arvore, j) for (_, j), arvore in zip(pares, arvores)]
+
+
+def _dijkstra_indices(lista_adj, origem, destino=-1):
+    """
+    Dijkstra sobre índices com heap binário e remoção preguiçosa. Retorna
+    (arvore, completa): arvore[v] = (distância, anterior) de cada vértice
+    já finalizado e completa=False se a busca parou no destino.
+    """
+    contadores['dijkstra'] += 1
+    distancia = {origem: 0}
+    arvore = {}
+    heap = [(0, origem, -1)]
+    while heap:
+        d, v, anterior = heapq.heappop(heap)
+        if v in arvore:
+            continue
+        arvore[v] = (d, anterior)
+        if v == destino:
+            return arvore, False
+        for w, peso in lista_adj[v]:
+            if w in arvore:
+                continue
+            if peso < 0:
+                raise ValueError("dijkstra() não aceita pesos negativos.")
+            nova = d + peso
+            if w not in distancia or nova < distancia[w]:
+                distancia[w] = nova
+                heapq.heappush(heap, (nova, w, v))
+    return arvore, True
+
+
+# Lista de adjacências enviada uma única vez a cada processo do dijkstra_em_lote()
+_lista_adj_dijkstra = None
 
-class BuscaUniaoSimples():
+
+def _iniciar_processo_dijkstra(lista_adj):
+    global _lista_adj_dijkstra
+    _lista_adj_dijkstra = lista_adj
+
+
+def _dijkstra_processo(par):
+    return _dijkstra_indices(_lista_adj_dijkstra, *par)
+
+class BuscaUniaoSimples(UniaoBusca):
+    """
+    Busca-união sobre rótulos de vértices. Os vértices são numerados 0..n-1
+    e o trabalho é feito pela UniaoBusca (compressão de caminho e união por
+    posto) de grafos_comum.py, sobre esses índices.
+    """
 
     def __init__(self, vertices):
         """
         Cada vértice começa como seu próprio "pai" (em seu próprio conjunto).
         """
-        self.parent = {v: v for v in vertices}
-        print(self.parent)
+        self.vertices = list(vertices)
+        self.indice = {v: i for i, v in enumerate(self.vertices)}
+        super().__init__(len(self.vertices))
 
     def find(self, v):
         """
         Encontra a raiz do conjunto ao qual 'v' pertence.
-        Faz isso simplesmente seguindo os ponteiros de "pai" até o topo
         """
-        root = ''
-        return root
+        contadores['find'] += 1
+        return self.vertices[self.buscar(self.indice[v])]
 
     def union(self, u, v):
         """
-        Une os conjuntos de 'u' e 'v' de forma arbitrária.
+        Une os conjuntos de 'u' e 'v'. Retorna True se eles estavam separados.
         """
-        root_u = self.find(u)
-        root_v = self.find(v)
-
-        # Se não estiverem no mesmo conjunto, une os dois
+        contadores['union'] += 1
+        return self.unir(self.indice[u], self.indice[v])
 
 
 def kruskal(grafo:GrafoEsparsoPonderado):
 
-    # 1. Ordena as arestas pelo peso
-   
+    # 1. Ordena as arestas (já com os índices dos vértices) pelo peso,
+    #    em uma única ordenação
+    sorted_edges = []
+    for aresta, quantidade in grafo._indice_arestas.items():
+        sorted_edges.extend([aresta] * quantidade)
+    sorted_edges.sort(key=itemgetter(2))
 
     # 2. Inicializa a estrutura BuscaUniaoSimples
-    uf = BuscaUniaoSimples(grafo.get_vertices())
+    rotulos = grafo.vertices
+    uf = BuscaUniaoSimples(rotulos)
+    unir = uf.unir
 
     minimum_spanning_tree = []
     total_weight = 0
-        
+    limite = len(rotulos) - 1
+
     # 3. Itera sobre as arestas ordenadas
-    for u, v, weight in sorted_edges:
+    unioes = 0
+    for i, j, weight in sorted_edges:
+        unioes += 1
         # 4. Se adicionar a aresta não formar um ciclo...
-        #    (ou seja, se u e v estiverem em conjuntos diferentes)
-        if :
+        #    (ou seja, se i e j estiverem em conjuntos diferentes)
+        if unir(i, j):
             # ...une os conjuntos e adiciona a aresta à árvore.
+            minimum_spanning_tree.append((rotulos[i], rotulos[j], weight))
+            total_weight += weight
+            # Uma árvore geradora tem exatamente n - 1 arestas
+            if len(minimum_spanning_tree) == limite:
+                break
 
-            
+    # Cada union faz dois finds; contados uma vez no fim para não pesar no laço
+    contadores['union'] += unioes
+    contadores['find'] += 2 * unioes
     return minimum_spanning_tree, total_weight
  
 
+# Kruskal externo
+#
+# As arestas de uma sequência ordenada ("run") são gravadas em disco como
+# registros de tamanho fixo: peso e os índices dos dois extremos. O peso é
+# int64 quando todos os pesos da run são inteiros que cabem nele (sem perda
+# de precisão acima de 2**53) e float64 caso contrário; cada run é um par
+# (caminho, formato do registro).
+_REGISTRO_INTEIRO = struct.Struct('<qqq')
+_REGISTRO_REAL = struct.Struct('<dqq')
+_REGISTROS_POR_LEITURA = 4096
+
+
+def _cabe_em_int64(peso):
+    return isinstance(peso, int) and -2**63 <= peso < 2**63
+
+
+def _ler_arestas_texto(caminho):
+    """
+    Gera (u, v, peso) de um arquivo texto com uma aresta por linha:
+    "u v peso" ou "u v" (peso 1). Linhas vazias ou iniciadas por '#' são ignoradas.
+    """
+    with open(caminho, encoding='utf-8') as arquivo:
+        for numero, linha in enumerate(arquivo, 1):
+            campos = linha.split()
+            if not campos or campos[0].startswith('#'):
+                continue
+            if len(campos) == 2:
+                yield campos[0], campos[1], 1
+            elif len(campos) == 3:
+                try:
+                    peso = int(campos[2])
+                except ValueError:
+                    peso = float(campos[2])
+                yield campos[0], campos[1], peso
+            else:
+                raise ValueError(f"Linha {numero} de '{caminho}' não é uma aresta: {linha.strip()!r}")
+
+
+def _gravar_run(diretorio, registros, inteiros):
+    registros.sort()
+    registro = _REGISTRO_INTEIRO if inteiros else _REGISTRO_REAL
+    descritor, caminho = tempfile.mkstemp(suffix='.run', dir=diretorio)
+    empacotar = registro.pack
+    with os.fdopen(descritor, 'wb') as arquivo:
+        for inicio in range(0, len(registros), _REGISTROS_POR_LEITURA):
+            arquivo.write(b''.join(empacotar(*r) for r in registros[inicio:inicio + _REGISTROS_POR_LEITURA]))
+    return caminho, registro
+
+
+def _ler_run(run):
+    """Gera os registros de uma run lendo o arquivo em blocos."""
+    caminho, registro = run
+    tamanho = registro.size * _REGISTROS_POR_LEITURA
+    with open(caminho, 'rb') as arquivo:
+        while True:
+            bloco = arquivo.read(tamanho)
+            if not bloco:
+                return
+            yield from registro.iter_unpack(bloco)
+
+
+def _intercalar_runs(diretorio, runs, max_runs):
+    """
+    Intercala as runs em grupos de até 'max_runs' arquivos abertos, em
+    quantas passadas forem necessárias, até restarem no máximo 'max_runs'.
+    """
+    while len(runs) > max_runs:
+        proximas = []
+        for inicio in range(0, len(runs), max_runs):
+            grupo = runs[inicio:inicio + max_runs]
+            # A run intercalada só é inteira se todas as do grupo forem
+            formato = _REGISTRO_INTEIRO
+            if any(r[1] is _REGISTRO_REAL for r in grupo):
+                formato = _REGISTRO_REAL
+            descritor, caminho = tempfile.mkstemp(suffix='.run', dir=diretorio)
+            empacotar = formato.pack
+            with os.fdopen(descritor, 'wb') as arquivo:
+                buffer = []
+                for registro in heapq.merge(*(_ler_run(r) for r in grupo)):
+                    buffer.append(empacotar(*registro))
+                    if len(buffer) == _REGISTROS_POR_LEITURA:
+                        arquivo.write(b''.join(buffer))
+                        buffer = []
+                arquivo.write(b''.join(buffer))
+            for r in grupo:
+                os.remove(r[0])
+            proximas.append((caminho, formato))
+        runs = proximas
+    return runs
+
+
+def kruskal_externo(caminho_arestas, arestas_por_run=1_000_000, max_runs=64, diretorio_temporario=None):
+    """
+    Kruskal para listas de arestas maiores que a memória. O arquivo texto
+    (uma aresta "u v peso" por linha) é lido em blocos de 'arestas_por_run'
+    arestas; cada bloco é ordenado e gravado em disco como uma run. As runs
+    são intercaladas (heapq.merge) e as arestas passam, já em ordem de peso,
+    por uma BuscaUniaoSimples indexada por inteiros: além das runs, só os
+    rótulos, a busca-união e a própria árvore ficam em memória (O(V)).
+    Retorna (arestas, custo), como kruskal().
+    """
+    tabela = TabelaDeRotulos()
+    internar = tabela.internar
+    pesos_inteiros = True
+
+    with tempfile.TemporaryDirectory(prefix='kruskal_', dir=diretorio_temporario) as diretorio:
+        # 1. Runs ordenadas por peso
+        runs = []
+        bloco = []
+        bloco_inteiro = True
+        for u, v, peso in _ler_arestas_texto(caminho_arestas):
+            i, j = internar(u), internar(v)
+            if i == j:
+                continue  # laços nunca entram na árvore
+            if bloco_inteiro and not _cabe_em_int64(peso):
+                bloco_inteiro = False
+            bloco.append((peso, i, j))
+            if len(bloco) == arestas_por_run:
+                runs.append(_gravar_run(diretorio, bloco, bloco_inteiro))
+                pesos_inteiros = pesos_inteiros and bloco_inteiro
+                bloco, bloco_inteiro = [], True
+        if bloco:
+            runs.append(_gravar_run(diretorio, bloco, bloco_inteiro))
+            pesos_inteiros = pesos_inteiros and bloco_inteiro
+            bloco = []
+
+        # 2. Intercalação e busca-união
+        runs = _intercalar_runs(diretorio, runs, max_runs)
+        rotulos = tabela.rotulos
+        uf = BuscaUniaoSimples(rotulos)
+        unir = uf.unir
+
+        minimum_spanning_tree = []
+        total_weight = 0
+        limite = len(rotulos) - 1
+        unioes = 0
+        for peso, i, j in heapq.merge(*(_ler_run(r) for r in runs)):
+            if len(minimum_spanning_tree) == limite:
+                break
+            unioes += 1
+            if unir(i, j):
+                if not pesos_inteiros:
+                    peso = float(peso)
+                minimum_spanning_tree.append((rotulos[i], rotulos[j], peso))
+                total_weight += peso
+
+    contadores['union'] += unioes
+    contadores['find'] += 2 * unioes
+    return minimum_spanning_tree, total_weight
+
+
+def _vizinhos_ponderados(grafo):
+    """
+    Retorna os rótulos e uma função que lista (índice do vizinho, peso) de
+    cada índice, tanto para um GrafoEsparsoPonderado quanto para uma matriz
+    de pesos (lista de listas, em que 0 ou None indicam ausência de aresta).
+    """
+    if isinstance(grafo, GrafoEsparsoPonderado):
+        # A lista de adjacências já guarda (índice do vizinho, peso)
+        rotulos = grafo.get_vertices()
+        vizinhos = grafo.lista_adj.__getitem__
+    else:
+        rotulos = [str(i) for i in range(len(grafo))]
+
+        def vizinhos(i):
+            return [(j, peso) for j, peso in enumerate(grafo[i]) if peso]
+    return rotulos, vizinhos
+
+
+def prim(grafo):
+    """
+    Árvore (ou floresta) geradora mínima pelo algoritmo de Prim, com um
+    heap binário e remoção preguiçosa: entradas obsoletas continuam no heap
+    e são descartadas quando saem dele. Aceita um GrafoEsparsoPonderado ou
+    uma matriz de pesos. Retorna (arestas, custo), como kruskal().
+    """
+    rotulos, vizinhos = _vizinhos_ponderados(grafo)
+    n = len(rotulos)
+    na_arvore = bytearray(n)
+
+    minimum_spanning_tree = []
+    total_weight = 0
+
+    # Recomeça de cada vértice ainda fora da árvore (grafos desconexos)
+    for raiz in range(n):
+        if na_arvore[raiz]:
+            continue
+        na_arvore[raiz] = 1
+        heap = [(peso, raiz, v) for v, peso in vizinhos(raiz)]
+        heapq.heapify(heap)
+        while heap:
+            peso, u, v = heapq.heappop(heap)
+            # Remoção preguiçosa: v já entrou na árvore por uma aresta melhor
+            if na_arvore[v]:
+                continue
+            na_arvore[v] = 1
+            minimum_spanning_tree.append((rotulos[u], rotulos[v], peso))
+            total_weight += peso
+            for w, peso_w in vizinhos(v):
+                if not na_arvore[w]:
+                    heapq.heappush(heap, (peso_w, v, w))
+
+    return minimum_spanning_tree, total_weight
+
+
+# Estado compartilhado pelos processos do Borůvka, enviado uma única vez
+# pelo inicializador do pool.
+_arestas_boruvka = None
+
+
+def _iniciar_processo_boruvka(origens, destinos, pesos):
+    global _arestas_boruvka
+    _arestas_boruvka = (origens, destinos, pesos)
+
+
+def _mais_baratas(componente, inicio, fim):
+    """
+    Para as arestas de índice em [inicio, fim), encontra a aresta mais barata
+    que sai de cada componente. Empates são desfeitos pelo índice da aresta,
+    o que garante que nenhuma escolha forme ciclo.
+    """
+    origens, destinos, pesos = _arestas_boruvka
+    melhor = {}
+    for k in range(inicio, fim):
+        cu = componente[origens[k]]
+        cv = componente[destinos[k]]
+        if cu == cv:
+            continue
+        candidata = (pesos[k], k)
+        if cu not in melhor or candidata < melhor[cu]:
+            melhor[cu] = candidata
+        if cv not in melhor or candidata < melhor[cv]:
+            melhor[cv] = candidata
+    return melhor
+
+
+def boruvka(grafo:GrafoEsparsoPonderado, workers=1):
+    """
+    Árvore (ou floresta) geradora mínima pelo algoritmo de Borůvka. Em cada
+    rodada a aresta mais barata que sai de cada componente é procurada em
+    paralelo, dividindo as arestas entre 'workers' processos.
+    Retorna (arestas, custo), como kruskal().
+    """
+    rotulos = grafo.get_vertices()
+    uf = BuscaUniaoSimples(rotulos)
+
+    origens, destinos, pesos = array('l'), array('l'), []
+    for (i, j, peso), quantidade in grafo._indice_arestas.items():
+        if i != j:
+            for _ in range(quantidade):
+                origens.append(i)
+                destinos.append(j)
+                pesos.append(peso)
+    m = len(pesos)
+
+    minimum_spanning_tree = []
+    total_weight = 0
+
+    executor = None
+    if workers > 1 and m:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_processo_boruvka,
+                                       initargs=(origens, destinos, pesos))
+    else:
+        _iniciar_processo_boruvka(origens, destinos, pesos)
+
+    try:
+        while True:
+            componente = array('l', (uf.buscar(i) for i in range(len(rotulos))))
+            contadores['find'] += len(rotulos)
+            if executor is not None:
+                tamanho = -(-m // workers)
+                futuros = [executor.submit(_mais_baratas, componente, inicio, min(inicio + tamanho, m))
+                           for inicio in range(0, m, tamanho)]
+                parciais = [f.result() for f in futuros]
+            else:
+                parciais = [_mais_baratas(componente, 0, m)]
+
+            # Junta os resultados parciais mantendo o mínimo de cada componente
+            melhor = {}
+            for parcial in parciais:
+                for comp, candidata in parcial.items():
+                    if comp not in melhor or candidata < melhor[comp]:
+                        melhor[comp] = candidata
+
+            if not melhor:
+                break
+            escolhidas = set(melhor.values())
+            contadores['union'] += len(escolhidas)
+            contadores['find'] += 2 * len(escolhidas)
+            for peso, k in escolhidas:
+                if uf.unir(origens[k], destinos[k]):
+                    minimum_spanning_tree.append((rotulos[origens[k]], rotulos[destinos[k]], peso))
+                    total_weight += peso
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return minimum_spanning_tree, total_weight
+
+
+class ArvoreGeradoraDinamica():
+    """
+    Árvore (ou floresta) geradora mínima de um GrafoEsparsoPonderado mantida
+    incrementalmente. Parte do resultado de kruskal() e, a cada aresta
+    inserida ou removida através deste objeto, corrige a árvore sem
+    reprocessar todas as arestas:
+
+    - inserção (propriedade do ciclo): a nova aresta fecha um ciclo com o
+      caminho entre u e v na árvore; se for mais barata que a aresta mais
+      cara desse caminho, toma o lugar dela;
+    - remoção de uma aresta da árvore: a árvore se divide em duas partes e
+      a aresta mais barata do grafo que liga as duas entra no lugar.
+
+    As alterações do grafo devem ser feitas por aqui para que a árvore
+    continue válida.
+    """
+
+    def __init__(self, grafo:GrafoEsparsoPonderado, resultado=None):
+        self.grafo = grafo
+        arestas, custo = resultado if resultado is not None else kruskal(grafo)
+        self.custo = custo
+        # Arestas da árvore por índice de vértice: {vizinho: peso}
+        # (a árvore não tem arestas paralelas)
+        self._adj = [{} for _ in grafo.vertices]
+        obter_indice = grafo._obter_indice
+        for u, v, peso in arestas:
+            self._ligar(obter_indice(u), obter_indice(v), peso)
+
+    def _ligar(self, i, j, peso):
+        self._adj[i][j] = peso
+        self._adj[j][i] = peso
+
+    def _desligar(self, i, j):
+        del self._adj[i][j]
+        del self._adj[j][i]
+
+    def arestas(self):
+        """Lista das arestas (u, v, peso) da árvore."""
+        rotulos = self.grafo.vertices
+        return [(rotulos[i], rotulos[j], peso) for i, vizinhos in enumerate(self._adj)
+                for j, peso in vizinhos.items() if i < j]
+
+    def _caminho(self, i, j):
+        """Arestas (a, b, peso) do caminho de i até j na árvore, ou None se não houver."""
+        anterior = {i: None}
+        fila = [i]
+        for x in fila:
+            if x == j:
+                break
+            for y in self._adj[x]:
+                if y not in anterior:
+                    anterior[y] = x
+                    fila.append(y)
+        if j not in anterior:
+            return None
+        caminho = []
+        while anterior[j] is not None:
+            a = anterior[j]
+            caminho.append((a, j, self._adj[a][j]))
+            j = a
+        return caminho
+
+    def _menor_lado(self, i, j):
+        """
+        Depois de desligar i-j, percorre as duas partes em largura
+        alternadamente e retorna os vértices da que terminar primeiro
+        (a menor), limitando o trabalho ao tamanho dela.
+        """
+        buscas = [([i], {i}), ([j], {j})]
+        posicoes = [0, 0]
+        while True:
+            for lado, (fila, vistos) in enumerate(buscas):
+                if posicoes[lado] == len(fila):
+                    return vistos
+                x = fila[posicoes[lado]]
+                posicoes[lado] += 1
+                for y in self._adj[x]:
+                    if y not in vistos:
+                        vistos.add(y)
+                        fila.append(y)
+
+    def adicionar_aresta(self, u, v, peso=1):
+        """
+        Adiciona a aresta ao grafo e atualiza a árvore. Retorna True se a
+        aresta entrou na árvore.
+        """
+        i, j = self.grafo._obter_indice(u), self.grafo._obter_indice(v)
+        self.grafo._adicionar(i, j, peso)
+        if i == j:
+            return False
+
+        caminho = self._caminho(i, j)
+        if caminho is None:
+            # Liga duas componentes da floresta
+            self._ligar(i, j, peso)
+            self.custo += peso
+            return True
+
+        a, b, mais_cara = max(caminho, key=itemgetter(2))
+        if peso >= mais_cara:
+            return False
+        self._desligar(a, b)
+        self._ligar(i, j, peso)
+        self.custo += peso - mais_cara
+        return True
+
+    def remover_aresta(self, u, v, peso=None):
+        """
+        Remove a aresta do grafo (a primeira entre u e v, se o peso não for
+        informado) e, se ela estava na árvore, procura uma substituta.
+        Retorna False se a aresta não existir.
+        """
+        grafo = self.grafo
+        i, j = grafo._obter_indice(u), grafo._obter_indice(v)
+        peso = grafo._remover(i, j, peso)
+        if peso is None:
+            return False
+
+        # Só muda a árvore se a aresta era dela e não sobrou uma cópia paralela de mesmo peso
+        par = grafo._chave_aresta(i, j)
+        if i == j or self._adj[i].get(j) != peso or par + (peso,) in grafo._indice_arestas:
+            return True
+        self._desligar(i, j)
+        self.custo -= peso
+
+        # Aresta mais barata do grafo entre a menor parte e o restante da componente
+        lado = self._menor_lado(i, j)
+        melhor = None
+        for x in lado:
+            for y, p in grafo.lista_adj[x]:
+                if y not in lado and (melhor is None or p < melhor[2]):
+                    melhor = (x, y, p)
+        if melhor is not None:
+            self._ligar(*melhor)
+            self.custo += melhor[2]
+        return True
+
+    def alterar_peso(self, u, v, peso_antigo, peso_novo):
+        """Troca o peso de uma aresta: remoção seguida de inserção."""
+        if not self.remover_aresta(u, v, peso_antigo):
+            raise ValueError(f"Aresta entre {u} e {v} com peso {peso_antigo} não existe.")
+        self.adicionar_aresta(u, v, peso_novo)
+
+
 if __name__ == "__main__":
     vertices_exemplo = ['A', 'B', 'C', 'D', 'E']
     grafo = GrafoEsparsoPonderado(labels=vertices_exemplo)
@@ -1,5 +1,26 @@
 import sys
+import logging
 from abc import ABC, abstractmethod
+from collections import Counter
+
+# Mensagens das operações no logger "grafos.matriz" (silencioso por padrão)
+# e contagens por operação em 'contadores'. stats() e zerar_stats() têm a
+# mesma API de turma_m.py e kruskal.py; este módulo não mede tempos.
+log = logging.getLogger("grafos.matriz")
+log.addHandler(logging.NullHandler())
+
+contadores = Counter()
+
+
+def stats():
+    """Retrato (cópia) das contagens por operação e dos tempos acumulados."""
+    return {'contadores': dict(contadores), 'tempos': {}}
+
+
+def zerar_stats():
+    """Zera as contagens por operação."""
+    contadores.clear()
+
 
 class Grafo(ABC):
     @abstractmethod
@@ -83,10 +104,11 @@ class GrafoDenso(Grafo):
 
             self.matriz[idx_u][idx_v] = 1
             self.matriz[idx_v][idx_u] = 1
+            contadores['arestas_adicionadas'] += 1
 
-            print(f"Aresta adicionada entre {u} e {v}.")
+            log.debug("Aresta adicionada entre %s e %s.", u, v)
         except ValueError as e:
-            print(f"Erro ao adicionar aresta: {e}")
+            log.error("Erro ao adicionar aresta: %s", e)
 
 
     def remover_aresta(self, u, v):
@@ -98,16 +120,17 @@ class GrafoDenso(Grafo):
             idx_v = self._obter_indice(v)
 
             if self.matriz[idx_u][idx_v] == 0:
-                print(f"Aresta entre {u} e {v} não existe.")
+                log.warning("Aresta entre %s e %s não existe.", u, v)
                 return
 
             # Remove a aresta
             self.matriz[idx_u][idx_v] = 0
             self.matriz[idx_v][idx_u] = 0
-            print(f"Aresta removida entre {u} e {v}.")
+            contadores['arestas_removidas'] += 1
+            log.debug("Aresta removida entre %s e %s.", u, v)
         
         except ValueError as e:
-            print(f"Erro ao remover aresta: {e}")
+            log.error("Erro ao remover aresta: %s", e)
 
     def imprimir(self):
         """Imprime a matriz de adjacência de forma legível."""
@@ -175,10 +198,11 @@ class GrafoEsparso(Grafo):
             # Pode adicionar aresta duplicada ou laço (loop)
             self.lista_adj[u].append(v)
             self.lista_adj[v].append(u)
- 
-            print(f"Aresta adicionada entre {u} e {v}")
+            contadores['arestas_adicionadas'] += 1
+
+            log.debug("Aresta adicionada entre %s e %s.", u, v)
         except ValueError as e:
-            print(f"Erro ao adicionar aresta: {e}")
+            log.error("Erro ao adicionar aresta: %s", e)
 
 
     # (v) Remoção de arestas
@@ -193,21 +217,22 @@ class GrafoEsparso(Grafo):
             for index, ver in enumerate(self.lista_adj[u]):
                 if v == ver:
                     del self.lista_adj[u][index]
-                    print(f"Aresta removida entre {u} e {v}.")
+                    contadores['arestas_removidas'] += 1
+                    log.debug("Aresta removida entre %s e %s.", u, v)
                     break
             else:
-                print(f"Aresta entre {u} e {v} não existe.")
+                log.warning("Aresta entre %s e %s não existe.", u, v)
 
             for index, ver in enumerate(self.lista_adj[v]):
                 if u == ver:
                     del self.lista_adj[v][index]
-                    print(f"Aresta removida entre {v} e {u}.")
+                    log.debug("Aresta removida entre %s e %s.", v, u)
                     break
             else:
-                print(f"Aresta entre {u} e {v} não existe.")
+                log.warning("Aresta entre %s e %s não existe.", u, v)
 
         except ValueError as e:
-            print(f"Erro ao remover aresta: {e}")
+            log.error("Erro ao remover aresta: %s", e)
 
 
 
@@ -0,0 +1,39 @@
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "src", "kruskal"))
+
+from turma_m import GrafoDenso, GrafoEsparso, GrafoEsparsoCSR  # noqa: E402
+from kruskal import GrafoEsparsoPonderado  # noqa: E402
+
+ARESTAS = [('A', 'B'), ('B', 'C'), ('C', 'A'), ('C', 'D'), ('D', 'D'), ('A', 'B')]
+
+
+def test_salvar_sobre_o_arquivo_carregado(tmp_path):
+    # Com mmap=True os vetores do grafo apontam para o próprio arquivo, que
+    # não pode ser truncado antes de ser lido
+    caminho = str(tmp_path / "grafo.bin")
+    for classe in (GrafoEsparso, GrafoDenso, GrafoEsparsoCSR):
+        grafo = classe(labels=['A', 'B', 'C', 'D'])
+        grafo.adicionar_arestas(ARESTAS)
+        grafo.salvar(caminho)
+
+        carregado = classe.carregar(caminho, mmap=True)
+        carregado.salvar(caminho)
+        relido = classe.carregar(caminho, mmap=True)
+        assert sorted(relido.get_arestas()) == sorted(grafo.get_arestas())
+        assert relido.sequencia_de_graus() == grafo.sequencia_de_graus()
+    assert os.listdir(tmp_path) == ["grafo.bin"]
+
+
+def test_salvar_ponderado_sobre_o_arquivo_carregado(tmp_path):
+    caminho = str(tmp_path / "grafo.bin")
+    grafo = GrafoEsparsoPonderado(labels=['A', 'B', 'C'])
+    grafo.adicionar_arestas([('A', 'B', 2**60 + 1), ('B', 'C', 3)])
+    grafo.salvar(caminho)
+
+    GrafoEsparsoPonderado.carregar(caminho).salvar(caminho)
+    relido = GrafoEsparsoPonderado.carregar(caminho)
+    assert sorted(relido.get_arestas()) == sorted(grafo.get_arestas())
@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from turma_m import GrafoDenso, GrafoDensoNumPy, GrafoEsparso, contadores, np, zerar_stats  # noqa: E402
+
+
+def completo(classe, n):
+    grafo = classe(num_vertices=n)
+    grafo.adicionar_arestas((str(u), str(v)) for u in range(n) for v in range(u + 1, n))
+    return grafo
+
+
+def test_grafos_simetricos_sao_podados():
+    # Sem a poda por automorfismos, K10 e o grafo vazio com 10 vértices
+    # percorrem uma árvore de busca fatorial (10! folhas); com ela, o número
+    # de nós é quadrático
+    for grafo in (completo(GrafoEsparso, 10), GrafoEsparso(num_vertices=10),
+                  completo(GrafoDenso, 10), GrafoDenso(num_vertices=10)):
+        zerar_stats()
+        grafo.hash_canonico()
+        assert 0 < contadores['nos_forma_canonica'] <= 10 * 10
+
+
+def test_forma_canonica_independe_da_numeracao():
+    arestas = [(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 5), (5, 3)]
+    permutacao = [4, 2, 5, 0, 1, 3]
+    g1 = GrafoEsparso(num_vertices=6)
+    g1.adicionar_arestas((str(u), str(v)) for u, v in arestas)
+    g2 = GrafoDenso(num_vertices=6)
+    g2.adicionar_arestas((str(permutacao[u]), str(permutacao[v])) for u, v in arestas)
+    assert g1.forma_canonica() == g2.forma_canonica()
+    assert completo(GrafoEsparso, 10).forma_canonica() == completo(GrafoDenso, 10).forma_canonica()
+    assert completo(GrafoEsparso, 10).forma_canonica() != GrafoEsparso(num_vertices=10).forma_canonica()
+
+
+def test_forma_canonica_distingue_lacos():
+    classes = [GrafoEsparso, GrafoDenso] + ([GrafoDensoNumPy] if np is not None else [])
+    for classe in classes:
+        caminho = classe(num_vertices=3)
+        caminho.adicionar_arestas([('0', '1'), ('1', '2')])
+        com_laco = classe(num_vertices=3)
+        com_laco.adicionar_arestas([('0', '1'), ('1', '2'), ('0', '0')])
+        laco_na_outra_ponta = classe(num_vertices=3)
+        laco_na_outra_ponta.adicionar_arestas([('0', '1'), ('1', '2'), ('2', '2')])
+        assert com_laco.forma_canonica() != caminho.forma_canonica()
+        assert com_laco.forma_canonica() == laco_na_outra_ponta.forma_canonica()
+    esparso = GrafoEsparso(num_vertices=3)
+    esparso.adicionar_arestas([('0', '1'), ('1', '2'), ('0', '0')])
+    denso = GrafoDenso(num_vertices=3)
+    denso.adicionar_arestas([('2', '1'), ('1', '0'), ('2', '2')])
+    assert esparso.forma_canonica() == denso.forma_canonica()
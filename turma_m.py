@@ -1,6 +1,463 @@
 import sys
-import itertools
+import functools
+import hashlib
+import inspect
+import logging
+import multiprocessing
+import time
 from abc import ABC, abstractmethod
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from grafos_comum import TabelaDeRotulos, UniaoBusca, escrever_binario, funcoes_de_stats, ler_binario
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: só GrafoDensoNumPy depende dele
+    np = None
+
+# Instrumentação
+#
+# As mensagens das operações vão para o logger "grafos", que por padrão não
+# tem saída (NullHandler); para vê-las basta configurar o logging da
+# aplicação, por exemplo logging.basicConfig(level=logging.DEBUG).
+# As contagens por operação ficam em 'contadores' e, com a temporização
+# ativada, o número de chamadas e o tempo de cada método público em 'tempos'.
+log = logging.getLogger("grafos")
+log.addHandler(logging.NullHandler())
+
+contadores = Counter()
+tempos = {}
+stats, zerar_stats = funcoes_de_stats(contadores, tempos)
+
+
+def _temporizado(nome, metodo):
+    """
+    Envolve 'metodo' acumulando em tempos[nome] as chamadas e os segundos
+    gastos. Nos geradores (bfs, dfs, componentes_conexas) criar o gerador
+    não custa nada: o tempo contado é o gasto produzindo cada item, à
+    medida que ele é consumido.
+    """
+    if inspect.isgeneratorfunction(metodo):
+        @functools.wraps(metodo)
+        def envoltorio(*args, **kwargs):
+            tempos.setdefault(nome, [0, 0.0])[0] += 1
+            return _consumo_temporizado(nome, metodo(*args, **kwargs))
+    else:
+        @functools.wraps(metodo)
+        def envoltorio(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return metodo(*args, **kwargs)
+            finally:
+                entrada = tempos.setdefault(nome, [0, 0.0])
+                entrada[0] += 1
+                entrada[1] += time.perf_counter() - inicio
+    envoltorio._original = metodo
+    return envoltorio
+
+
+def _consumo_temporizado(nome, gerador):
+    """Repassa os itens de 'gerador' somando em tempos[nome] só o tempo gasto dentro dele."""
+    segundos = 0.0
+    try:
+        while True:
+            inicio = time.perf_counter()
+            try:
+                item = next(gerador)
+            except StopIteration:
+                return
+            finally:
+                segundos += time.perf_counter() - inicio
+            yield item
+    finally:
+        # Fechar o gerador interno executa os seus blocos finally (os
+        # percursos atualizam 'visitados' neles)
+        gerador.close()
+        tempos.setdefault(nome, [0, 0.0])[1] += segundos
+
+
+def _classes_de_grafo():
+    classes, pendentes = [], [Grafo]
+    while pendentes:
+        classe = pendentes.pop()
+        classes.append(classe)
+        pendentes.extend(classe.__subclasses__())
+    return classes
+
+
+def ativar_temporizacao():
+    """
+    Envolve todos os métodos públicos de Grafo e das suas subclasses (já
+    definidas) com medição de tempo. Os resultados aparecem em stats().
+    """
+    for classe in _classes_de_grafo():
+        for nome, valor in list(vars(classe).items()):
+            if nome.startswith('_') or not inspect.isfunction(valor) or hasattr(valor, '_original'):
+                continue
+            setattr(classe, nome, _temporizado(f"{classe.__name__}.{nome}", valor))
+
+
+def desativar_temporizacao():
+    """Restaura os métodos originais envolvidos por ativar_temporizacao()."""
+    for classe in _classes_de_grafo():
+        for nome, valor in list(vars(classe).items()):
+            if hasattr(valor, '_original'):
+                setattr(classe, nome, valor._original)
+
+# Motor de isomorfismo
+#
+# As funções abaixo trabalham apenas com índices: cada grafo é uma lista
+# 'adj' em que adj[i] é um dicionário {vizinho: multiplicidade}.
+
+def _refinar_cores(adj1, adj2):
+    """
+    Refinamento de cores (1-WL) feito em conjunto nos dois grafos, para que
+    as cores sejam comparáveis. A cor inicial é o par (grau, laços); a cada
+    rodada a nova cor de um vértice é definida pela cor atual mais o
+    multiconjunto das cores dos vizinhos. Para quando nenhuma classe se divide.
+    """
+    def cor_inicial(adj):
+        return [(sum(viz.values()) + viz.get(i, 0), viz.get(i, 0)) for i, viz in enumerate(adj)]
+
+    assinaturas = [cor_inicial(adj1), cor_inicial(adj2)]
+    num_classes = -1
+    while True:
+        # Renomeia as assinaturas para inteiros pequenos, na mesma ordem para os dois grafos
+        tabela = {assinatura: cor for cor, assinatura in
+                  enumerate(sorted(set(assinaturas[0]) | set(assinaturas[1])))}
+        cores1 = [tabela[a] for a in assinaturas[0]]
+        cores2 = [tabela[a] for a in assinaturas[1]]
+        if len(tabela) == num_classes:
+            return cores1, cores2
+        num_classes = len(tabela)
+
+        assinaturas = [
+            [(cores[i], tuple(sorted((cores[j], m) for j, m in viz.items())))
+             for i, viz in enumerate(adj)]
+            for adj, cores in ((adj1, cores1), (adj2, cores2))
+        ]
+
+
+def _refinar_particao(adj, cores):
+    """
+    Refinamento de cores (1-WL) de um único grafo a partir da coloração
+    'cores'. As novas cores são atribuídas pela ordem das assinaturas, que
+    começam pela cor anterior: o resultado só depende da estrutura do grafo
+    e preserva a ordem entre as classes já existentes.
+    """
+    num_classes = len(set(cores))
+    while True:
+        assinaturas = [(cores[i], tuple(sorted((cores[j], m) for j, m in viz.items())))
+                       for i, viz in enumerate(adj)]
+        tabela = {assinatura: cor for cor, assinatura in enumerate(sorted(set(assinaturas)))}
+        cores = [tabela[a] for a in assinaturas]
+        if len(tabela) == num_classes:
+            return cores
+        num_classes = len(tabela)
+
+
+def _codificar(adj, cores):
+    """Lista de adjacências reescrita com as posições dadas por uma coloração discreta."""
+    arestas = []
+    for i, viz in enumerate(adj):
+        for j, multiplicidade in viz.items():
+            if cores[i] <= cores[j]:
+                arestas.append((cores[i], cores[j], multiplicidade))
+    arestas.sort()
+    return (len(adj),) + tuple(x for aresta in arestas for x in aresta)
+
+
+def _individualizar(adj, cores, v):
+    # v fica logo antes das demais cores da sua classe
+    individual = [2 * c for c in cores]
+    individual[v] -= 1
+    return _refinar_particao(adj, individual)
+
+
+def _orbitas(geradores, fixos, n):
+    """
+    Órbitas (como representante de cada vértice) do grupo gerado pelos
+    automorfismos de 'geradores' que fixam todos os vértices de 'fixos'.
+    """
+    uniao = UniaoBusca(n)
+    for gerador in geradores:
+        if all(gerador[x] == x for x in fixos):
+            for v, imagem in enumerate(gerador):
+                uniao.unir(v, imagem)
+    return uniao.buscar
+
+
+def _forma_canonica(adj):
+    """
+    Forma canônica por refinamento e individualização: enquanto a partição
+    não é discreta, cada vértice da menor classe não unitária é
+    individualizado (recebe uma cor própria) e a partição é refinada de novo.
+    Cada folha dá uma numeração dos vértices; fica a menor codificação.
+    Grafos isomorfos produzem exatamente os mesmos bytes.
+
+    A árvore é podada por automorfismos, como no nauty: duas folhas com a
+    mesma codificação definem um automorfismo, que leva o ramo atual a um
+    ramo já explorado a partir do ancestral comum (a busca volta direto
+    para ele). Num nó, um vértice na órbita de um filho já explorado (pelos
+    automorfismos que fixam os vértices individualizados até ali) não é
+    individualizado de novo. Sem isso a árvore é fatorial em grafos
+    simétricos, como os completos e os vazios.
+    """
+    n = len(adj)
+    iniciais = [(sum(viz.values()) + viz.get(i, 0), viz.get(i, 0)) for i, viz in enumerate(adj)]
+    geradores = []
+    # Folhas de referência (codificação, vértices individualizados, numeração)
+    primeira = melhor = None
+    # Quadros da busca: [individualizados, cores, filhos, próximo filho, órbitas]
+    pilha = []
+    caminho, cores = (), _refinar_particao(adj, iniciais)
+    nos = 0
+    while True:
+        nos += 1
+        tamanhos = Counter(cores)
+        celulas = [cor for cor, tamanho in tamanhos.items() if tamanho > 1]
+        if celulas:
+            alvo = min(celulas, key=lambda cor: (tamanhos[cor], cor))
+            pilha.append([caminho, cores, [v for v, cor in enumerate(cores) if cor == alvo], 0, None])
+        else:
+            codigo = _codificar(adj, cores)
+            if primeira is None:
+                primeira = melhor = (codigo, caminho, cores)
+            else:
+                for referencia in (primeira, melhor):
+                    if codigo == referencia[0]:
+                        # Automorfismo: vértice desta folha -> vértice na mesma posição na referência
+                        vertice_na_posicao = [0] * n
+                        for v, posicao in enumerate(referencia[2]):
+                            vertice_na_posicao[posicao] = v
+                        geradores.append([vertice_na_posicao[posicao] for posicao in cores])
+                        comum = 0
+                        while caminho[comum] == referencia[1][comum]:
+                            comum += 1
+                        del pilha[comum + 1:]
+                        break
+                else:
+                    if codigo < melhor[0]:
+                        melhor = (codigo, caminho, cores)
+
+        # Próximo filho ainda não coberto por um automorfismo
+        while pilha:
+            quadro = pilha[-1]
+            caminho_q, cores_q, filhos, proximo, orbitas = quadro
+            while proximo < len(filhos):
+                v = filhos[proximo]
+                proximo += 1
+                if proximo > 1:
+                    if orbitas is None or orbitas[0] != len(geradores):
+                        orbitas = (len(geradores), _orbitas(geradores, caminho_q, n))
+                    buscar = orbitas[1]
+                    if any(buscar(v) == buscar(w) for w in filhos[:proximo - 1]):
+                        continue
+                break
+            else:
+                pilha.pop()
+                continue
+            quadro[3], quadro[4] = proximo, orbitas
+            caminho, cores = caminho_q + (v,), _individualizar(adj, cores_q, v)
+            break
+        else:
+            break
+    contadores['nos_forma_canonica'] += nos
+    return array('q', melhor[0]).tobytes()
+
+
+def _ordem_de_busca(adj, cores):
+    """
+    Ordena os vértices do grafo 1 para a busca: começa pela menor classe de
+    cor e segue em largura, para que cada vértice (exceto o primeiro de cada
+    componente) tenha um vizinho já mapeado que restrinja os candidatos.
+    Retorna a ordem e, para cada posição, esse vizinho "âncora" (ou -1).
+    """
+    tamanho_classe = Counter(cores)
+    restantes = sorted(range(len(adj)), key=lambda i: (tamanho_classe[cores[i]], -len(adj[i])))
+    visitado = [False] * len(adj)
+    ordem, ancoras = [], []
+    for raiz in restantes:
+        if visitado[raiz]:
+            continue
+        visitado[raiz] = True
+        ordem.append(raiz)
+        ancoras.append(-1)
+        inicio = len(ordem) - 1
+        while inicio < len(ordem):
+            u = ordem[inicio]
+            inicio += 1
+            novos = [w for w in adj[u] if not visitado[w]]
+            novos.sort(key=lambda w: tamanho_classe[cores[w]])
+            for w in novos:
+                visitado[w] = True
+                ordem.append(w)
+                ancoras.append(u)
+    return ordem, ancoras
+
+
+class _BuscaIsomorfismo:
+    """
+    Busca com retrocesso (iterativa, sem recursão) de um isomorfismo que
+    respeite as cores. As primeiras escolhas da ordem de busca podem ser
+    fixadas por um prefixo, o que permite dividir a árvore de busca entre
+    vários processos.
+    """
+
+    def __init__(self, adj1, adj2, cores1, cores2):
+        self.adj1, self.adj2 = adj1, adj2
+        self.cores1, self.cores2 = cores1, cores2
+        self.n = len(adj1)
+        self.ordem, self.ancoras = _ordem_de_busca(adj1, cores1)
+        self.classes2 = {}
+        for c, cor in enumerate(cores2):
+            self.classes2.setdefault(cor, []).append(c)
+
+    def _fixar(self, prefixo):
+        """Reinicia o mapeamento e aplica as escolhas do prefixo."""
+        self.m1 = [-1] * self.n
+        self.m2 = [-1] * self.n
+        for nivel, c in enumerate(prefixo):
+            u = self.ordem[nivel]
+            self.m1[u] = c
+            self.m2[c] = u
+
+    def _candidatos(self, nivel):
+        u = self.ordem[nivel]
+        cor = self.cores1[u]
+        if self.ancoras[nivel] >= 0:
+            base = self.adj2[self.m1[self.ancoras[nivel]]]
+        else:
+            base = self.classes2.get(cor, ())
+        m2, cores2 = self.m2, self.cores2
+        return [c for c in base if m2[c] == -1 and cores2[c] == cor]
+
+    def _viavel(self, u, c):
+        m1, m2 = self.m1, self.m2
+        viz_u, viz_c = self.adj1[u], self.adj2[c]
+        if viz_u.get(u, 0) != viz_c.get(c, 0):
+            return False
+        mapeados = 0
+        for w, multiplicidade in viz_u.items():
+            if w != u and m1[w] != -1:
+                if viz_c.get(m1[w], 0) != multiplicidade:
+                    return False
+                mapeados += 1
+        # Vizinhos de c já usados devem corresponder a vizinhos de u já mapeados
+        return mapeados == sum(1 for x in viz_c if x != c and m2[x] != -1)
+
+    def extensoes(self, prefixo):
+        """Candidatos viáveis para o próximo nível depois do prefixo."""
+        self._fixar(prefixo)
+        u = self.ordem[len(prefixo)]
+        return [c for c in self._candidatos(len(prefixo)) if self._viavel(u, c)]
+
+    def buscar(self, prefixo=(), parar=None):
+        """
+        Completa o prefixo até um isomorfismo. Retorna a lista imagem[i] ou
+        None. Se 'parar' (um Event) for sinalizado, desiste e retorna None.
+        """
+        n = self.n
+        self._fixar(prefixo)
+        m1, m2, ordem = self.m1, self.m2, self.ordem
+
+        pilha = []
+        nivel = len(prefixo)
+        pendentes = iter(self._candidatos(nivel)) if nivel < n else None
+        passos = 0
+        try:
+            while nivel < n:
+                passos += 1
+                if parar is not None and passos % 1024 == 0 and parar.is_set():
+                    return None
+                u = ordem[nivel]
+                for c in pendentes:
+                    if self._viavel(u, c):
+                        m1[u] = c
+                        m2[c] = u
+                        pilha.append(pendentes)
+                        nivel += 1
+                        pendentes = iter(self._candidatos(nivel)) if nivel < n else None
+                        break
+                else:
+                    # Nenhum candidato serviu: desfaz a última escolha
+                    if not pilha:
+                        return None
+                    pendentes = pilha.pop()
+                    nivel -= 1
+                    u = ordem[nivel]
+                    m2[m1[u]] = -1
+                    m1[u] = -1
+            return list(m1)
+        finally:
+            # Nós da árvore de busca visitados nesta chamada
+            self.passos = passos
+            contadores['nos_isomorfismo'] += passos
+
+
+def _buscar_isomorfismo(adj1, adj2, cores1, cores2):
+    return _BuscaIsomorfismo(adj1, adj2, cores1, cores2).buscar()
+
+
+# Estado de cada processo da busca paralela, definido pelo inicializador
+# do pool para que os grafos sejam enviados uma única vez por processo.
+_busca_do_processo = None
+_parar_do_processo = None
+
+
+def _iniciar_processo_isomorfismo(adj1, adj2, cores1, cores2, parar):
+    global _busca_do_processo, _parar_do_processo
+    _busca_do_processo = _BuscaIsomorfismo(adj1, adj2, cores1, cores2)
+    _parar_do_processo = parar
+
+
+def _buscar_ramo(prefixo):
+    """Retorna (imagem ou None, nós visitados) de um ramo da busca."""
+    if _parar_do_processo.is_set():
+        return None, 0
+    resultado = _busca_do_processo.buscar(prefixo, _parar_do_processo)
+    if resultado is not None:
+        _parar_do_processo.set()
+    return resultado, _busca_do_processo.passos
+
+
+def _buscar_isomorfismo_paralelo(adj1, adj2, cores1, cores2, workers):
+    """
+    Divide a árvore de busca nos primeiros níveis de ramificação e distribui
+    os ramos entre 'workers' processos. Todos param assim que um deles
+    encontra um isomorfismo.
+    """
+    busca = _BuscaIsomorfismo(adj1, adj2, cores1, cores2)
+    n = busca.n
+
+    # Expande os primeiros níveis até haver ramos suficientes para os processos
+    prefixos = [()]
+    while prefixos and len(prefixos) < 4 * workers and len(prefixos[0]) < min(n, 4):
+        prefixos = [p + (c,) for p in prefixos for c in busca.extensoes(p)]
+    if not prefixos:
+        return None
+    if len(prefixos) == 1 or len(prefixos[0]) == n:
+        return busca.buscar(prefixos[0])
+
+    contexto = multiprocessing.get_context()
+    parar = contexto.Event()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=contexto,
+                             initializer=_iniciar_processo_isomorfismo,
+                             initargs=(adj1, adj2, cores1, cores2, parar)) as executor:
+        futuros = [executor.submit(_buscar_ramo, prefixo) for prefixo in prefixos]
+        for futuro in as_completed(futuros):
+            # Os contadores dos processos não voltam sozinhos: soma os nós aqui
+            resultado, passos = futuro.result()
+            contadores['nos_isomorfismo'] += passos
+            if resultado is not None:
+                parar.set()
+                for pendente in futuros:
+                    pendente.cancel()
+                return resultado
+    return None
+
 
 class Grafo(ABC):
     @abstractmethod
@@ -27,6 +484,129 @@ class Grafo(ABC):
     def imprimir(self):
         pass
 
+    # Operações em lote: não imprimem nada e devolvem os erros encontrados.
+    # Cada representação fornece _obter_indice (rótulo -> chave interna),
+    # _adicionar(u, v) e _remover(u, v), que recebem chaves já validadas.
+    def adicionar_arestas(self, arestas):
+        """
+        Adiciona várias arestas de uma vez, sem imprimir nada.
+        Aceita qualquer iterável de pares (u, v), inclusive geradores.
+        Retorna a lista de erros no formato (aresta, mensagem).
+        """
+        erros = []
+        obter_indice = self._obter_indice
+        adicionar = self._adicionar
+        for aresta in arestas:
+            try:
+                u, v = aresta
+                adicionar(obter_indice(u), obter_indice(v))
+            except (ValueError, TypeError) as e:
+                erros.append((aresta, str(e)))
+        return erros
+
+    def remover_arestas(self, arestas):
+        """
+        Remove várias arestas de uma vez, sem imprimir nada.
+        Aceita qualquer iterável de pares (u, v), inclusive geradores.
+        Retorna a lista de erros no formato (aresta, mensagem).
+        """
+        erros = []
+        obter_indice = self._obter_indice
+        remover = self._remover
+        for aresta in arestas:
+            try:
+                u, v = aresta
+                if not remover(obter_indice(u), obter_indice(v)):
+                    erros.append((aresta, f"Aresta entre {u} e {v} não existe."))
+            except (ValueError, TypeError) as e:
+                erros.append((aresta, str(e)))
+        return erros
+
+    # Cache de invariantes
+    #
+    # Cada representação chama _iniciar_invariantes no construtor e
+    # _registrar_alteracao em toda inserção/remoção efetiva. O número de
+    # arestas e o vetor de graus são mantidos incrementalmente; os valores
+    # derivados ficam memorizados até a próxima alteração (contador _versao).
+    def _iniciar_invariantes(self, num_vertices):
+        self._versao = 0
+        self._cache = {}
+        self._num_arestas = 0
+        self._graus = array('q', bytes(8 * num_vertices))
+
+    def _registrar_alteracao(self, delta_arestas, indices, delta_grau):
+        contadores['arestas_adicionadas' if delta_grau > 0 else 'arestas_removidas'] += 1
+        self._num_arestas += delta_arestas
+        for i in indices:
+            self._graus[i] += delta_grau
+        self._versao += 1
+
+    def _memorizado(self, nome, calcular):
+        """Retorna o valor memorizado de 'nome', recalculando-o se o grafo mudou."""
+        entrada = self._cache.get(nome)
+        if entrada is not None and entrada[0] == self._versao:
+            return entrada[1]
+        valor = calcular()
+        self._cache[nome] = (self._versao, valor)
+        return valor
+
+    def hash_invariante(self):
+        """
+        Hash do número de vértices, número de arestas e sequência de graus.
+        Grafos isomorfos têm sempre o mesmo hash.
+        """
+        return self._memorizado('hash_invariante', lambda: hash(
+            (self.numero_de_vertices(), self.numero_de_arestas(), tuple(self.sequencia_de_graus()))))
+
+    # Persistência em disco
+    def _para_csr(self):
+        """
+        Retorna (rótulos, offsets, vizinhos) do grafo em formato CSR, com cada
+        aresta nas linhas dos dois extremos (laços duas vezes na mesma linha).
+        """
+        rotulos = list(self.get_vertices())
+        posicao = {v: i for i, v in enumerate(rotulos)}
+        linhas = [[] for _ in rotulos]
+        for u, v in self.get_arestas():
+            linhas[posicao[u]].append(posicao[v])
+            linhas[posicao[v]].append(posicao[u])
+        offsets = array('q', [0])
+        vizinhos = array('q')
+        for linha in linhas:
+            vizinhos.extend(linha)
+            offsets.append(len(vizinhos))
+        return rotulos, offsets, vizinhos
+
+    def salvar(self, caminho):
+        """Grava o grafo no formato binário (cabeçalho, rótulos, offsets e vizinhos)."""
+        rotulos, offsets, vizinhos = self._para_csr()
+        escrever_binario(caminho, type(self).__name__, rotulos, offsets, vizinhos)
+
+    @classmethod
+    def carregar(cls, caminho, mmap=True):
+        """
+        Lê um grafo gravado por salvar(). O arquivo é lido através de um
+        mapeamento em memória (mmap); arquivos de qualquer representação podem
+        ser carregados em qualquer outra.
+        """
+        dados = ler_binario(caminho, usar_mmap=mmap)
+        rotulos, offsets, vizinhos = dados['rotulos'], dados['offsets'], dados['vizinhos']
+        grafo = cls(labels=rotulos)
+        obter_indice, adicionar = grafo._obter_indice, grafo._adicionar
+        for i in range(len(rotulos)):
+            chave_i = obter_indice(rotulos[i])
+            lacos = 0
+            for k in range(offsets[i], offsets[i + 1]):
+                j = vizinhos[k]
+                # Cada aresta é inserida uma vez, a partir do extremo de menor índice
+                if j > i:
+                    adicionar(chave_i, obter_indice(rotulos[j]))
+                elif j == i:
+                    lacos += 1
+                    if lacos % 2 == 0:
+                        adicionar(chave_i, chave_i)
+        return grafo
+
     #Aula 3 - Atividade 1
     @abstractmethod
     def is_simples(self):
@@ -49,81 +629,240 @@ class Grafo(ABC):
     def get_arestas(self):
         pass
 
-    @abstractmethod
+    def _pares_de_arestas(self):
+        """
+        Uma tripla (i, j, multiplicidade) para cada par de índices i <= j
+        ligado. Esta versão genérica conta get_arestas() a cada chamada; as
+        representações a substituem por leituras diretas das suas estruturas.
+        """
+        obter_indice = self._obter_indice
+        contagem = Counter()
+        for u, v in self.get_arestas():
+            i, j = obter_indice(u), obter_indice(v)
+            contagem[(i, j) if i <= j else (j, i)] += 1
+        for (i, j), quantidade in contagem.items():
+            yield i, j, quantidade
+
+    def _indices_em(self, outro_grafo):
+        """
+        Índice no outro grafo de cada vértice deste (na ordem dos índices),
+        ou None se algum vértice não existir no outro grafo.
+        """
+        mapa = outro_grafo.tabela.indices
+        indices = [mapa.get(v) for v in self.tabela.rotulos]
+        if None in indices:
+            return None
+        return indices
+
     def is_subgrafo(self, outro_grafo):
-        pass
+        if not isinstance(outro_grafo, Grafo):
+            raise TypeError("O grafo fornecido deve ser uma instância de Grafo.")
+
+        # Verifica se todos os vértices do grafo atual estão no outro grafo
+        indices = self._indices_em(outro_grafo)
+        if indices is None:
+            return False
+
+        # Verifica se as arestas do grafo atual aparecem no outro grafo,
+        # na mesma quantidade, consultando a multiplicidade direto nele
+        multiplicidade = outro_grafo._multiplicidade
+        for i, j, quantidade in self._pares_de_arestas():
+            if multiplicidade(indices[i], indices[j]) != quantidade:
+                return False
+
+        # Se todas as arestas e vértices estão presentes, é um subgrafo
+        return True
 
-    @abstractmethod
     def is_subgrafo_gerador(self, outro_grafo):
-        pass
+        if not isinstance(outro_grafo, Grafo):
+            raise TypeError("O grafo fornecido deve ser uma instância de Grafo.")
 
-    @abstractmethod
-    def is_subgrafo_induzido(self, outro_grafo):
-        pass
+        # Um subgrafo gerador tem todos os vértices do outro grafo
+        if self.numero_de_vertices() != outro_grafo.numero_de_vertices():
+            return False
+        return self.is_subgrafo(outro_grafo)
 
-    #Aula 3 - Atividade 3
-    def _checa_mapeamento_preserva_adjacencia(self, grafo1, grafo2, mapping):
-        """
-        Verifica se uma dada correspondência (mapping) entre vértices preserva
-        a estrutura de adjacência dos grafos.
-        """
-        # Itera sobre todos os pares possíveis de vértices no primeiro grafo
-        arestas_1 = grafo1.get_arestas()
-        arestas_2 = grafo2.get_arestas()
+    def is_subgrafo_induzido(self, outro_grafo):
+        if not isinstance(outro_grafo, Grafo):
+            raise TypeError("O grafo fornecido deve ser uma instância de Grafo.")
 
-        for aresta in arestas_1:
-            u1, v1 = aresta
-            # Obtém os índices correspondentes no grafo 2
-            u2 = mapping[u1]
-            v2 = mapping[v1]
+        if not self.is_subgrafo(outro_grafo):
+            return False
 
-            # Verifica se a aresta (u1, v1) no grafo 1 tem uma aresta correspondente (u2, v2) no grafo 2
-            if ((u2, v2) not in arestas_2) and ((v2, u2) not in arestas_2):
+        # Toda aresta do outro grafo entre vértices deste grafo também deve
+        # estar aqui (as multiplicidades já foram comparadas acima)
+        mapa = self.tabela.indices
+        proprios = [mapa.get(v) for v in outro_grafo.tabela.rotulos]
+        multiplicidade = self._multiplicidade
+        for i, j, _ in outro_grafo._pares_de_arestas():
+            a, b = proprios[i], proprios[j]
+            if a is not None and b is not None and not multiplicidade(a, b):
                 return False
-
-        # Se todos os pares preservam a adjacência, a correspondência é válida.
         return True
 
-    def is_isomorfo(self, grafo):
+    #Aula 3 - Atividade 3
+    def _estrutura_adjacencia(self):
         """
-        Verifica se dois grafos são isomorfos usando força 
-        bruta com poda por invariantes.
+        Converte o grafo para a forma usada pelo motor de isomorfismo:
+        a lista de rótulos e, para cada índice, um dicionário
+        {índice do vizinho: multiplicidade}.
+        """
+        vertices = list(self.get_vertices())
+        posicao = {vertice: i for i, vertice in enumerate(vertices)}
+        adj = [{} for _ in vertices]
+        for u, v in self.get_arestas():
+            i, j = posicao[u], posicao[v]
+            adj[i][j] = adj[i].get(j, 0) + 1
+            if i != j:
+                adj[j][i] = adj[j].get(i, 0) + 1
+        return vertices, adj
+
+    def mapeamento_isomorfismo(self, grafo, workers=1):
+        """
+        Procura um isomorfismo entre este grafo e 'grafo'.
+        Retorna um dicionário {vértice deste grafo: vértice de 'grafo'}
+        ou None se os grafos não forem isomorfos.
+
+        Os vértices são particionados por refinamento de cores (1-WL) e a
+        busca com retrocesso (no estilo do VF2) só tenta candidatos da mesma
+        cor que sejam compatíveis com os vértices já mapeados. Com
+        workers > 1 os ramos da busca são divididos entre processos.
         """
         # --- ETAPA 1: PODA RÁPIDA COM INVARIANTES ---
 
+        # 0. Hash dos invariantes (memorizado em cada grafo)
+        if self.hash_invariante() != grafo.hash_invariante():
+            return None
+
         # 1. Invariante: Número de Vértices
         if (self.numero_de_vertices() != grafo.numero_de_vertices()):
-            return False
-                
+            return None
+
         # 2. Invariante: Número de Arestas
         if (self.numero_de_arestas() != grafo.numero_de_arestas()):
-            return False
-                
+            return None
+
         # 3. Invariante: Sequência de Graus
         if self.sequencia_de_graus() != grafo.sequencia_de_graus():
-            return False
+            return None
 
-        # --- ETAPA 2: BUSCA EXAUSTIVA (FORÇA BRUTA) ---
+        # --- ETAPA 2: REFINAMENTO DE CORES ---
+        vertices1, adj1 = self._estrutura_adjacencia()
+        vertices2, adj2 = grafo._estrutura_adjacencia()
 
-        # Se os invariantes passaram, devemos testar as correspondências.
-        vertices1 = list(self.get_vertices())
-        vertices2 = list(grafo.get_vertices())
+        cores1, cores2 = _refinar_cores(adj1, adj2)
+        if sorted(cores1) != sorted(cores2):
+            return None
 
-        # Gera todas as permutações dos vértices do grafo 2.
-        #Ex. [1,2] -> (1,2), (2,1)
-        # Cada permutação é uma potencial correspondência para os vértices do grafo 1.
-        for p in itertools.permutations(vertices2):
-            #Cria o mapeamento dos vértices do grafo 1 para o grafo 2
-            #Ex. [A,B] e (1,2), (2,1) -> {A:1, B:2}, {A:2, B:1}
-            mapping = dict(zip(vertices1, p))
-    
-                
-            # Verifica se esta correspondência preserva a estrutura de arestas
-            if self._checa_mapeamento_preserva_adjacencia(self, grafo, mapping):
-                return True
-                    
-        # Se testou todas as permutações e nenhuma funcionou, eles não são isomorfos.
-        return False
+        # --- ETAPA 3: BUSCA COM RETROCESSO ---
+        if workers > 1:
+            resultado = _buscar_isomorfismo_paralelo(adj1, adj2, cores1, cores2, workers)
+        else:
+            resultado = _buscar_isomorfismo(adj1, adj2, cores1, cores2)
+        if resultado is None:
+            return None
+        return {vertices1[i]: vertices2[j] for i, j in enumerate(resultado)}
+
+    def is_isomorfo(self, grafo, workers=1):
+        """
+        Verifica se dois grafos são isomorfos. Com workers > 1 a busca é
+        dividida entre vários processos.
+        """
+        return self.mapeamento_isomorfismo(grafo, workers) is not None
+
+    def forma_canonica(self):
+        """
+        Codificação em bytes que independe dos rótulos: dois grafos são
+        isomorfos se e somente se têm a mesma forma canônica.
+        """
+        return self._memorizado('forma_canonica',
+                                lambda: _forma_canonica(self._estrutura_adjacencia()[1]))
+
+    def hash_canonico(self):
+        """Resumo SHA-256 (hexadecimal) da forma canônica."""
+        return self._memorizado('hash_canonico',
+                                lambda: hashlib.sha256(self.forma_canonica()).hexdigest())
+
+    # Percursos
+    #
+    # Os percursos trabalham com os índices da tabela de rótulos e só
+    # traduzem para rótulos o que entregam. Os vértices visitados ficam em
+    # um bytearray com um bit por vértice; bfs() e dfs() são geradores, de
+    # modo que nada além da fronteira (fila ou pilha) é materializado.
+    def _funcao_vizinhos(self):
+        """
+        Função índice -> iterável dos índices vizinhos. Esta versão genérica
+        parte de _estrutura_adjacencia(); as representações a substituem
+        por acessos diretos às suas estruturas.
+        """
+        return self._estrutura_adjacencia()[1].__getitem__
+
+    def _novos_visitados(self):
+        return bytearray((self.numero_de_vertices() + 7) // 8)
+
+    def _percorrer_largura(self, origem, visitados):
+        vizinhos = self._funcao_vizinhos()
+        visitados[origem >> 3] |= 1 << (origem & 7)
+        fila = array('q', [origem])
+        inicio = 0
+        while inicio < len(fila):
+            v = fila[inicio]
+            inicio += 1
+            yield v
+            for w in vizinhos(v):
+                if not visitados[w >> 3] >> (w & 7) & 1:
+                    visitados[w >> 3] |= 1 << (w & 7)
+                    fila.append(w)
+
+    def _percorrer_profundidade(self, origem, visitados):
+        vizinhos = self._funcao_vizinhos()
+        visitados[origem >> 3] |= 1 << (origem & 7)
+        yield origem
+        # Pilha de iteradores: cada vértice retoma seus vizinhos de onde parou
+        pilha = [iter(vizinhos(origem))]
+        while pilha:
+            for w in pilha[-1]:
+                if not visitados[w >> 3] >> (w & 7) & 1:
+                    visitados[w >> 3] |= 1 << (w & 7)
+                    yield w
+                    pilha.append(iter(vizinhos(w)))
+                    break
+            else:
+                pilha.pop()
+
+    def bfs(self, origem):
+        """Gera os vértices alcançáveis a partir de 'origem' em ordem de busca em largura."""
+        rotulos = self.tabela.rotulos
+        for i in self._percorrer_largura(self.tabela.indice(origem), self._novos_visitados()):
+            yield rotulos[i]
+
+    def dfs(self, origem):
+        """Gera os vértices alcançáveis a partir de 'origem' em pré-ordem de busca em profundidade (iterativa)."""
+        rotulos = self.tabela.rotulos
+        for i in self._percorrer_profundidade(self.tabela.indice(origem), self._novos_visitados()):
+            yield rotulos[i]
+
+    def componentes_conexas(self):
+        """Gera as componentes conexas, cada uma como uma lista de vértices."""
+        rotulos = self.tabela.rotulos
+        visitados = self._novos_visitados()
+        for i in range(self.numero_de_vertices()):
+            if not visitados[i >> 3] >> (i & 7) & 1:
+                yield [rotulos[j] for j in self._percorrer_largura(i, visitados)]
+
+    def is_conexo(self):
+        n = self.numero_de_vertices()
+        if n == 0:
+            return True
+        return sum(1 for _ in self._percorrer_largura(0, self._novos_visitados())) == n
+
+    def mesma_componente(self, u, v):
+        """Verifica se existe caminho entre u e v (percorrendo o grafo a partir de u)."""
+        i, j = self.tabela.indice(u), self.tabela.indice(v)
+        return any(w == j for w in self._percorrer_largura(i, self._novos_visitados()))
+
+    def numero_de_componentes(self):
+        return sum(1 for _ in self.componentes_conexas())
 
 
 
@@ -131,62 +870,213 @@ class GrafoDenso(Grafo):
     # Definição do grafo
     def __init__(self, num_vertices=None, labels=None):
         if labels:
-            self.labels = labels
-            self.num_vertices = len(labels)
-            self.mapa_labels = {label: i for i, label in enumerate(labels)}
+            self.tabela = TabelaDeRotulos(labels)
         elif num_vertices:
-            self.num_vertices = num_vertices
-            self.labels = [str(i) for i in range(num_vertices)]
-            self.mapa_labels = {str(i): i for i in range(num_vertices)}
+            self.tabela = TabelaDeRotulos(str(i) for i in range(num_vertices))
         else:
             print("Erro: Forneça 'num_vertices' ou uma lista de 'labels'.")
             sys.exit(1)
+        # Visões da tabela de rótulos (índice -> rótulo e rótulo -> índice)
+        self.labels = self.tabela.rotulos
+        self.mapa_labels = self.tabela.indices
+        self.num_vertices = len(self.tabela)
+
+        self._alocar_matriz()
+        self._iniciar_invariantes(self.num_vertices)
+        # Linhas ainda compartilhadas com um snapshot (ver snapshot())
+        self._compartilhadas = None
+
+    def _alocar_matriz(self):
+        # Cria a matriz de adjacência NxN preenchida com zeros, guardando um
+        # bit por célula: a linha i é um bytearray em que o bit j indica a
+        # aresta (i, j).
+        self.bytes_por_linha = (self.num_vertices + 7) // 8
+        self.linhas = [bytearray(self.bytes_por_linha) for i in range(self.num_vertices)]
+
+    @property
+    def matriz(self):
+        """Matriz de adjacência NxN como lista de listas de 0/1 (apenas leitura)."""
+        return [[self._tem_bit(i, j) for j in range(self.num_vertices)]
+                for i in range(self.num_vertices)]
+
+    def _linha_como_int(self, i):
+        # Converte a linha i em um inteiro para operações de palavra inteira
+        # (popcount, deslocamentos e comparações).
+        return int.from_bytes(self.linhas[i], 'little')
+
+    def _tem_bit(self, i, j):
+        return (self.linhas[i][j >> 3] >> (j & 7)) & 1
+
+    def _ligar_bit(self, i, j):
+        self.linhas[i][j >> 3] |= 1 << (j & 7)
+
+    def _desligar_bit(self, i, j):
+        self.linhas[i][j >> 3] &= ~(1 << (j & 7)) & 0xFF
+
+    # Percursos com fronteira em bits: cada linha da matriz vira um inteiro
+    # e a expansão de um nível é um OU das linhas seguido de um E com os
+    # ainda não visitados.
+    def _funcao_vizinhos(self):
+        def vizinhos(i):
+            resto = self._linha_como_int(i)
+            while resto:
+                bit = resto & -resto
+                yield bit.bit_length() - 1
+                resto ^= bit
+        return vizinhos
+
+    def _percorrer_largura(self, origem, visitados):
+        mascara = (1 << self.num_vertices) - 1
+        nao_visitados = ~int.from_bytes(visitados, 'little') & mascara & ~(1 << origem)
+        fronteira = 1 << origem
+        try:
+            while fronteira:
+                proxima = 0
+                while fronteira:
+                    bit = fronteira & -fronteira
+                    fronteira ^= bit
+                    v = bit.bit_length() - 1
+                    yield v
+                    proxima |= self._linha_como_int(v)
+                fronteira = proxima & nao_visitados
+                nao_visitados ^= fronteira
+        finally:
+            visitados[:] = (~nao_visitados & mascara).to_bytes(len(visitados), 'little')
+
+    def _percorrer_profundidade(self, origem, visitados):
+        mascara = (1 << self.num_vertices) - 1
+        nao_visitados = ~int.from_bytes(visitados, 'little') & mascara & ~(1 << origem)
+        try:
+            yield origem
+            # Pilha com a linha de cada vértice do caminho atual
+            pilha = [self._linha_como_int(origem)]
+            while pilha:
+                candidatos = pilha[-1] & nao_visitados
+                if not candidatos:
+                    pilha.pop()
+                    continue
+                bit = candidatos & -candidatos
+                nao_visitados ^= bit
+                w = bit.bit_length() - 1
+                yield w
+                pilha.append(self._linha_como_int(w))
+        finally:
+            visitados[:] = (~nao_visitados & mascara).to_bytes(len(visitados), 'little')
 
-        # Cria a matriz de adjacência NxN preenchida com zeros
-        self.matriz = [[0] * self.num_vertices for i in range(self.num_vertices)]
-        
-    
     def numero_de_vertices(self):
         # Retorna o número total de vértices no grafo.
         return self.num_vertices
 
-    def numero_de_arestas(self):
-        # Retorna o número total de arestas no grafo.
-        count = 0
+    def _para_csr(self):
+        # Percorre os bits ligados de cada linha; o laço (bit da diagonal)
+        # é gravado duas vezes, como nas listas de adjacências.
+        offsets = array('q', [0])
+        vizinhos = array('q')
         for i in range(self.num_vertices):
-            for j in range(i + 1, self.num_vertices):
-                if self.matriz[i][j] != 0:
-                    count += 1
-        return count
+            resto = self._linha_como_int(i)
+            while resto:
+                bit = resto & -resto
+                j = bit.bit_length() - 1
+                vizinhos.append(j)
+                if j == i:
+                    vizinhos.append(j)
+                resto ^= bit
+            offsets.append(len(vizinhos))
+        return list(self.labels), offsets, vizinhos
+
+    def _estrutura_adjacencia(self):
+        # Parte direto dos bits de cada linha: get_arestas() omite a
+        # diagonal, mas os laços precisam aparecer para a forma canônica e
+        # para o isomorfismo distinguirem grafos que só diferem neles.
+        adj = []
+        for i in range(self.num_vertices):
+            vizinhos = {}
+            resto = self._linha_como_int(i)
+            while resto:
+                bit = resto & -resto
+                vizinhos[bit.bit_length() - 1] = 1
+                resto ^= bit
+            adj.append(vizinhos)
+        return list(self.labels), adj
+
+    def numero_de_arestas(self):
+        # Retorna o número total de arestas no grafo (laços não são contados).
+        return self._num_arestas
 
     def sequencia_de_graus(self):
         # Retorna uma lista com os graus de todos os vértices.
-        return sorted([sum(row) for row in self.matriz])
+        return self._memorizado('sequencia_de_graus', lambda: sorted(self._graus))
 
 
+    # Snapshots com cópia na escrita, linha a linha
+    def _copiar_linhas(self, *indices):
+        """Antes de alterar uma linha ainda compartilhada com um snapshot, troca-a por uma cópia."""
+        compartilhadas = self._compartilhadas
+        for i in indices:
+            if compartilhadas[i]:
+                self.linhas[i] = bytearray(self.linhas[i])
+                compartilhadas[i] = 0
+
+    def snapshot(self):
+        """
+        Vista imutável do grafo neste momento, que pode ser lida por outras
+        threads enquanto este grafo continua sendo alterado. As linhas da
+        matriz são compartilhadas: criar o snapshot copia só a lista de
+        referências (O(V)) e cada alteração posterior copia apenas as
+        linhas que muda, na primeira vez em que as muda.
+        """
+        copia = _Instantaneo.criar(GrafoDensoInstantaneo, self)
+        copia.linhas = list(self.linhas)
+        self._compartilhadas = bytearray(b'\x01') * self.num_vertices
+        return copia
+
     def _obter_indice(self, vertice):
-        if isinstance(vertice, str) and vertice in self.mapa_labels:
+        # Caminho comum: o rótulo está na tabela. Inteiros de 0 a n - 1 que
+        # não sejam rótulos continuam aceitos como índices diretos.
+        try:
             return self.mapa_labels[vertice]
-        elif isinstance(vertice, int) and 0 <= vertice < self.num_vertices:
+        except (KeyError, TypeError):
+            pass
+        if isinstance(vertice, int) and 0 <= vertice < self.num_vertices:
             return vertice
+        raise ValueError(f"Vértice '{vertice}' é inválido.")
+
+
+    def _adicionar(self, idx_u, idx_v):
+        if self._tem_bit(idx_u, idx_v):
+            return
+        if self._compartilhadas is not None:
+            self._copiar_linhas(idx_u, idx_v)
+        self._ligar_bit(idx_u, idx_v)
+        self._ligar_bit(idx_v, idx_u)
+        if idx_u == idx_v:
+            # Laço: ocupa um único bit e não conta como aresta
+            self._registrar_alteracao(0, (idx_u,), 1)
         else:
-            raise ValueError(f"Vértice '{vertice}' é inválido.")
+            self._registrar_alteracao(1, (idx_u, idx_v), 1)
 
+    def _remover(self, idx_u, idx_v):
+        if not self._tem_bit(idx_u, idx_v):
+            return False
+        if self._compartilhadas is not None:
+            self._copiar_linhas(idx_u, idx_v)
+        self._desligar_bit(idx_u, idx_v)
+        self._desligar_bit(idx_v, idx_u)
+        if idx_u == idx_v:
+            self._registrar_alteracao(0, (idx_u,), -1)
+        else:
+            self._registrar_alteracao(-1, (idx_u, idx_v), -1)
+        return True
 
     def adicionar_aresta(self, u, v):
         """
         Adiciona a aresta entre os vértices u e v.
         """
         try:
-            idx_u = self._obter_indice(u)
-            idx_v = self._obter_indice(v)
-
-            self.matriz[idx_u][idx_v] = 1
-            self.matriz[idx_v][idx_u] = 1
-
-            print(f"Aresta adicionada entre {u} e {v}.")
+            self._adicionar(self._obter_indice(u), self._obter_indice(v))
+            log.debug("Aresta adicionada entre %s e %s.", u, v)
         except ValueError as e:
-            print(f"Erro ao adicionar aresta: {e}")
+            log.error("Erro ao adicionar aresta: %s", e)
 
 
     def remover_aresta(self, u, v):
@@ -194,20 +1084,13 @@ class GrafoDenso(Grafo):
         Remove a aresta entre os vértices u e v.
         """
         try:
-            idx_u = self._obter_indice(u)
-            idx_v = self._obter_indice(v)
-
-            if self.matriz[idx_u][idx_v] == 0:
-                print(f"Aresta entre {u} e {v} não existe.")
+            if not self._remover(self._obter_indice(u), self._obter_indice(v)):
+                log.warning("Aresta entre %s e %s não existe.", u, v)
                 return
-
-            # Remove a aresta
-            self.matriz[idx_u][idx_v] = 0
-            self.matriz[idx_v][idx_u] = 0
-            print(f"Aresta removida entre {u} e {v}.")
+            log.debug("Aresta removida entre %s e %s.", u, v)
         
         except ValueError as e:
-            print(f"Erro ao remover aresta: {e}")
+            log.error("Erro ao remover aresta: %s", e)
 
     def imprimir(self):
         """Imprime a matriz de adjacência de forma legível."""
@@ -225,9 +1108,12 @@ class GrafoDenso(Grafo):
 
     #Aula 3 - Atividade 1
     def is_simples(self):
-        #Percorre a matriz de adjacência para verificar se há laços 
+        return self._memorizado('is_simples', self._calcular_is_simples)
+
+    def _calcular_is_simples(self):
+        #Percorre a diagonal da matriz de adjacência para verificar se há laços 
         for i in range(self.num_vertices):
-            if self.matriz[i][i] != 0:
+            if self._tem_bit(i, i):
                 return False
 
         return True
@@ -239,11 +1125,20 @@ class GrafoDenso(Grafo):
 
 
     def is_completo(self):
-        if (self.is_simples()) and (
-            self.numero_de_arestas() == (self.numero_de_vertices() *
-                                         (self.numero_de_vertices() - 1)) // 2):
-            return True
-        return False    
+        return self._memorizado('is_completo', self._calcular_is_completo)
+
+    def _calcular_is_completo(self):
+        # Teste rápido pelos invariantes já mantidos
+        n = self.num_vertices
+        if self._num_arestas != n * (n - 1) // 2 or not self.is_simples():
+            return False
+        # Em um grafo completo cada linha tem todos os bits ligados, exceto
+        # o da diagonal; a comparação é feita com a linha inteira de uma vez.
+        cheia = (1 << self.num_vertices) - 1
+        for i in range(self.num_vertices):
+            if self._linha_como_int(i) != cheia ^ (1 << i):
+                return False
+        return True
     
 
     #Aula 3 - Atividade 2
@@ -253,73 +1148,290 @@ class GrafoDenso(Grafo):
     def get_arestas(self):
         arestas = []
         for i in range(self.num_vertices):
-            for j in range(i + 1, self.num_vertices):
-                if self.matriz[i][j] != 0:
-                    arestas.append((self.labels[i], self.labels[j]))
+            # Percorre apenas os bits ligados acima da diagonal
+            resto = self._linha_como_int(i) >> (i + 1)
+            while resto:
+                bit = resto & -resto
+                j = i + bit.bit_length()
+                arestas.append((self.labels[i], self.labels[j]))
+                resto ^= bit
         return arestas
 
+    # Nas comparações de subgrafos os laços (diagonal) ficam de fora, como
+    # em get_arestas() e nos caminhos diretos pela matriz
+    def _pares_de_arestas(self):
+        for i in range(self.num_vertices):
+            resto = self._linha_como_int(i) >> (i + 1)
+            while resto:
+                bit = resto & -resto
+                yield i, i + bit.bit_length(), 1
+                resto ^= bit
+
+    def _multiplicidade(self, i, j):
+        return self._tem_bit(i, j) if i != j else 0
+
     def is_subgrafo(self, outro_grafo):
-        if not isinstance(outro_grafo, Grafo):
-            raise TypeError("O grafo fornecido deve ser uma instância de Grafo.")
+        if type(outro_grafo) is not GrafoDenso or type(self) is not GrafoDenso:
+            return super().is_subgrafo(outro_grafo)
 
-        # Verifica se todos os vértices do grafo atual estão no outro grafo
-        for vertice in self.get_vertices():
-            if vertice not in outro_grafo.get_vertices():
-                return False
+        indices = self._indices_em(outro_grafo)
+        if indices is None:
+            return False
 
-        for aresta in self.get_arestas():
-            if aresta not in outro_grafo.get_arestas():
-                return False
-            
-        #Compara se as arestas aparecem na mesma quantidade em ambos os grafos
-        for aresta in self.get_arestas():
-            if self.get_arestas().count(aresta) != outro_grafo.get_arestas().count(aresta):
-                return False
-            
-        # Se todas as arestas e vértices estão presentes, é um subgrafo
+        # Consulta direta na matriz do outro grafo para cada aresta (sem laços)
+        for i in range(self.num_vertices):
+            resto = self._linha_como_int(i) >> (i + 1)
+            oi = indices[i]
+            while resto:
+                bit = resto & -resto
+                if not outro_grafo._tem_bit(oi, indices[i + bit.bit_length()]):
+                    return False
+                resto ^= bit
         return True
-    
 
-    def is_subgrafo_gerador(self, outro_grafo):
-        if not isinstance(outro_grafo, Grafo):
-            raise TypeError("O grafo fornecido deve ser uma instância de Grafo.")
+    def is_subgrafo_induzido(self, outro_grafo):
+        if type(outro_grafo) is not GrafoDenso or type(self) is not GrafoDenso:
+            return super().is_subgrafo_induzido(outro_grafo)
 
-        if self.is_subgrafo(outro_grafo):
-            if (all(vertice in self.get_vertices() for vertice in outro_grafo.get_vertices())):
-                return True
-            else:
-                return False
-        else:
+        if not self.is_subgrafo(outro_grafo):
             return False
 
-    def is_subgrafo_induzido(self, outro_grafo):
-        if not isinstance(outro_grafo, Grafo):
-            raise TypeError("O grafo fornecido deve ser uma instância de Grafo.")
+        # Restrita aos vértices escolhidos (máscara), cada linha do outro grafo
+        # deve ter tantos vizinhos quanto a linha correspondente deste grafo
+        indices = self._indices_em(outro_grafo)
+        mascara = 0
+        for oi in indices:
+            mascara |= 1 << oi
+        for i, oi in enumerate(indices):
+            propria = self._linha_como_int(i) & ~(1 << i)
+            restrita = outro_grafo._linha_como_int(oi) & mascara & ~(1 << oi)
+            if propria.bit_count() != restrita.bit_count():
+                return False
+        return True
 
-        if self.is_subgrafo(outro_grafo):
-            lista_arestas = []
-            #Filtra apenas as arestas que conectam os vértices do subgrafo
-            for aresta in outro_grafo.get_arestas():
-                if all(v in self.get_vertices() for v in aresta):
-                    lista_arestas.append(aresta)
+    # Matrizes de todos os pares (requerem NumPy)
+    def _bloco_de_linhas(self, inicio, fim):
+        """Linhas [inicio, fim) da matriz de adjacência como ndarray de 0/1 (uint8)."""
+        empacotadas = np.frombuffer(b''.join(self.linhas[inicio:fim]), dtype=np.uint8)
+        empacotadas = empacotadas.reshape(fim - inicio, self.bytes_por_linha)
+        return np.unpackbits(empacotadas, axis=1, count=self.num_vertices, bitorder='little')
+
+    @staticmethod
+    def _nova_matriz(forma, dtype, arquivo):
+        # Em memória ou, com 'arquivo', um .npy mapeado em disco (np.load(arquivo, mmap_mode='r'))
+        if arquivo is None:
+            return np.empty(forma, dtype=dtype)
+        return np.lib.format.open_memmap(arquivo, mode='w+', dtype=dtype, shape=forma)
+
+    def distancias_todos_pares(self, tamanho_bloco=256, arquivo=None):
+        """
+        Matriz NxN (float32) com o número de arestas do menor caminho entre
+        cada par de vértices (inf se não houver caminho; 0 na diagonal).
+
+        Floyd–Warshall em blocos: para cada bloco K de pivôs, as linhas de K
+        são fechadas em memória e as demais linhas são atualizadas bloco a
+        bloco por D[I, :] = min(D[I, :], D[I, k] + D[k, :]), uma operação
+        vetorizada por pivô. Com 'arquivo' a matriz fica mapeada em disco e
+        só alguns blocos de linhas ficam em memória por vez.
+        """
+        if np is None:
+            raise ImportError("distancias_todos_pares() requer o pacote NumPy.")
+        n = self.num_vertices
+        distancias = self._nova_matriz((n, n), np.float32, arquivo)
+        for inicio in range(0, n, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, n)
+            bloco = np.where(self._bloco_de_linhas(inicio, fim) != 0, np.float32(1), np.float32(np.inf))
+            bloco[np.arange(fim - inicio), np.arange(inicio, fim)] = 0
+            distancias[inicio:fim] = bloco
+
+        for inicio_k in range(0, n, tamanho_bloco):
+            fim_k = min(inicio_k + tamanho_bloco, n)
+            # Fase 1: fecha as linhas dos pivôs usando apenas elas mesmas
+            pivos = np.array(distancias[inicio_k:fim_k])
+            for local, k in enumerate(range(inicio_k, fim_k)):
+                np.minimum(pivos, pivos[:, k, None] + pivos[local, None, :], out=pivos)
+            distancias[inicio_k:fim_k] = pivos
+
+            # Fase 2: o caminho de i a j passa pelo primeiro pivô k que visita,
+            # então basta D[i, k] (ainda sem K) somado à linha fechada de k
+            for inicio in range(0, n, tamanho_bloco):
+                if inicio == inicio_k:
+                    continue
+                fim = min(inicio + tamanho_bloco, n)
+                bloco = np.array(distancias[inicio:fim])
+                ate_pivos = bloco[:, inicio_k:fim_k].copy()
+                for local in range(fim_k - inicio_k):
+                    np.minimum(bloco, ate_pivos[:, local, None] + pivos[local, None, :], out=bloco)
+                distancias[inicio:fim] = bloco
+        if arquivo is not None:
+            distancias.flush()
+        return distancias
+
+    def fecho_transitivo(self, arquivo=None):
+        """
+        Matriz de alcançabilidade empacotada em bits: ndarray uint8 de forma
+        (N, ceil(N / 8)) em que o bit j (ordem little) da linha i indica que
+        há um caminho com pelo menos uma aresta de i a j. Para a matriz 0/1:
+        np.unpackbits(fecho, axis=1, count=N, bitorder='little').
+
+        Como o grafo não é orientado, o alcance de todos os vértices de uma
+        componente é o OU das linhas da componente; as componentes são
+        percorridas com fronteiras em bits.
+        """
+        if np is None:
+            raise ImportError("fecho_transitivo() requer o pacote NumPy.")
+        n = self.num_vertices
+        tamanho = (n + 7) // 8
+        fecho = self._nova_matriz((n, tamanho), np.uint8, arquivo)
+        nao_visitados = (1 << n) - 1
+        while nao_visitados:
+            inicial = nao_visitados & -nao_visitados
+            nao_visitados ^= inicial
+            componente = fronteira = inicial
+            alcance = 0
+            while fronteira:
+                proxima = 0
+                while fronteira:
+                    bit = fronteira & -fronteira
+                    fronteira ^= bit
+                    linha = self._linha_como_int(bit.bit_length() - 1)
+                    proxima |= linha
+                alcance |= proxima
+                fronteira = proxima & nao_visitados
+                nao_visitados ^= fronteira
+                componente |= fronteira
+            membros = []
+            while componente:
+                bit = componente & -componente
+                componente ^= bit
+                membros.append(bit.bit_length() - 1)
+            fecho[membros] = np.frombuffer(alcance.to_bytes(tamanho, 'little'), dtype=np.uint8)
+        if arquivo is not None:
+            fecho.flush()
+        return fecho
+
+
+class GrafoDensoNumPy(GrafoDenso):
+    """
+    Variante de GrafoDenso em que a matriz de adjacência é um ndarray NxN
+    de uint8 (requer NumPy). Contagens, graus, laços e comparações de
+    subgrafos são feitos com operações vetorizadas sobre a matriz inteira.
+    """
 
-            for aresta in self.get_arestas():
-                if aresta not in lista_arestas:
-                    return False
-                
-            for aresta in outro_grafo.get_arestas():
-                if aresta not in self.get_arestas():
-                    return False
-                
-            return True
-        else:
+    def _alocar_matriz(self):
+        if np is None:
+            raise ImportError("GrafoDensoNumPy requer o pacote NumPy.")
+        self.matriz_np = np.zeros((self.num_vertices, self.num_vertices), dtype=np.uint8)
+
+    @property
+    def matriz(self):
+        """Matriz de adjacência NxN como lista de listas de 0/1 (apenas leitura)."""
+        return self.matriz_np.tolist()
+
+    def _linha_como_int(self, i):
+        return int.from_bytes(np.packbits(self.matriz_np[i], bitorder='little').tobytes(), 'little')
+
+    def _bloco_de_linhas(self, inicio, fim):
+        return self.matriz_np[inicio:fim]
+
+    def snapshot(self):
+        # A matriz é um único bloco contíguo: o snapshot leva uma cópia dela
+        copia = _Instantaneo.criar(GrafoDensoNumPyInstantaneo, self)
+        copia.matriz_np = self.matriz_np.copy()
+        return copia
+
+    def _tem_bit(self, i, j):
+        return int(self.matriz_np[i, j])
+
+    def _ligar_bit(self, i, j):
+        self.matriz_np[i, j] = 1
+
+    def _desligar_bit(self, i, j):
+        self.matriz_np[i, j] = 0
+
+    def _recontar_invariantes(self):
+        """Recalcula arestas (triângulo superior) e graus (somas das linhas)."""
+        matriz = self.matriz_np
+        self._num_arestas = int(np.count_nonzero(np.triu(matriz, 1)))
+        self._graus = array('q', matriz.sum(axis=1, dtype=np.int64).tolist())
+        self._versao += 1
+
+    def _indices(self, rotulos):
+        return np.fromiter((self._obter_indice(v) for v in rotulos), dtype=np.intp)
+
+    def adicionar_arestas(self, arestas):
+        """
+        Adiciona várias arestas de uma vez, sem imprimir nada. Os índices são
+        resolvidos em lote e a matriz é atualizada com uma única atribuição
+        vetorizada. Retorna a lista de erros no formato (aresta, mensagem).
+        """
+        erros = []
+        origens, destinos = [], []
+        obter_indice = self._obter_indice
+        for aresta in arestas:
+            try:
+                u, v = aresta
+                idx_u, idx_v = obter_indice(u), obter_indice(v)
+            except (ValueError, TypeError) as e:
+                erros.append((aresta, str(e)))
+                continue
+            origens.append(idx_u)
+            destinos.append(idx_v)
+        if origens:
+            self.matriz_np[origens, destinos] = 1
+            self.matriz_np[destinos, origens] = 1
+            self._recontar_invariantes()
+            contadores['arestas_adicionadas'] += len(origens)
+        return erros
+
+    def _calcular_is_simples(self):
+        # Laços ficam na diagonal
+        return not self.matriz_np.diagonal().any()
+
+    def _calcular_is_completo(self):
+        n = self.num_vertices
+        if self._num_arestas != n * (n - 1) // 2:
             return False
-        
+        return bool((self.matriz_np == 1 - np.eye(n, dtype=np.uint8)).all())
+
+    def get_arestas(self):
+        origens, destinos = np.nonzero(np.triu(self.matriz_np, 1))
+        labels = self.labels
+        return [(labels[i], labels[j]) for i, j in zip(origens.tolist(), destinos.tolist())]
 
+    def _submatriz_em(self, outro_grafo):
+        """
+        Bloco da matriz do outro grafo correspondente aos vértices deste,
+        na mesma ordem, ou None se algum vértice não existir no outro grafo.
+        """
+        mapa = outro_grafo.mapa_labels
+        if any(v not in mapa for v in self.labels):
+            return None
+        indices = np.fromiter((mapa[v] for v in self.labels), dtype=np.intp, count=self.num_vertices)
+        return outro_grafo.matriz_np[np.ix_(indices, indices)]
 
-   
+    def is_subgrafo(self, outro_grafo):
+        if not isinstance(outro_grafo, GrafoDensoNumPy):
+            return super().is_subgrafo(outro_grafo)
+        bloco = self._submatriz_em(outro_grafo)
+        if bloco is None:
+            return False
+        # Toda aresta deste grafo (fora da diagonal) existe no outro
+        return bool((np.triu(self.matriz_np, 1) <= np.triu(bloco, 1)).all())
 
+    def is_subgrafo_gerador(self, outro_grafo):
+        if not isinstance(outro_grafo, GrafoDensoNumPy):
+            return super().is_subgrafo_gerador(outro_grafo)
+        return self.num_vertices == outro_grafo.num_vertices and self.is_subgrafo(outro_grafo)
 
+    def is_subgrafo_induzido(self, outro_grafo):
+        if not isinstance(outro_grafo, GrafoDensoNumPy):
+            return super().is_subgrafo_induzido(outro_grafo)
+        bloco = self._submatriz_em(outro_grafo)
+        if bloco is None:
+            return False
+        # As arestas entre os vértices escolhidos devem ser exatamente as deste grafo
+        return bool(np.array_equal(np.triu(self.matriz_np, 1), np.triu(bloco, 1)))
 
 
 
@@ -333,16 +1445,26 @@ class GrafoEsparso(Grafo):
     def __init__(self, num_vertices=None, labels=None):
 
         if labels:
-            self.vertices = labels
+            self.tabela = TabelaDeRotulos(labels)
         elif num_vertices:
-            self.vertices = [str(i) for i in range(num_vertices)]
+            self.tabela = TabelaDeRotulos(str(i) for i in range(num_vertices))
         else:
             print("Erro: Forneça 'num_vertices' ou uma lista de 'labels'.")
             sys.exit(1)
+        self.vertices = self.tabela.rotulos
+
+        # A lista de adjacências guarda, para o índice de cada vértice, um
+        # Counter {índice do vizinho: multiplicidade}, o que torna consultas
+        # e remoções O(1) mesmo em vértices de grau alto.
+        # Um laço em v conta uma vez em lista_adj[v][v].
+        self.lista_adj = [Counter() for _ in self.vertices]
+        self._iniciar_invariantes(len(self.vertices))
 
-        # A lista de adjacências é um dicionário onde cada vértice
-        # é uma chave e o valor é a lista de seus vizinhos.
-        self.lista_adj = {vertice: [] for vertice in self.vertices}
+        # Índice de conectividade opcional (ver ativar_indice_conectividade)
+        self._conectividade = None
+        self._conectividade_valida = False
+        # Listas ainda compartilhadas com um snapshot (ver snapshot())
+        self._compartilhadas = None
 
   
     def numero_de_vertices(self):
@@ -351,62 +1473,145 @@ class GrafoEsparso(Grafo):
 
     def numero_de_arestas(self):
         # Retorna o número total de arestas no grafo.
-        return (sum([len(vizinhos) for vizinhos in self.lista_adj.values()]) // 2)
+        return self._num_arestas
 
 
     def sequencia_de_graus(self):
         # Retorna uma lista com os graus de todos os vértices.
-        return sorted([len(values) for values in self.lista_adj.values()])
+        return self._memorizado('sequencia_de_graus', lambda: sorted(self._graus))
 
 
     def _validar_vertice(self, vertice):
         """Método auxiliar para checar se um vértice existe no grafo."""
-        if vertice not in self.lista_adj:
-            raise ValueError(f"Vértice '{vertice}' não existe no grafo.")
+        self.tabela.indice(vertice)
+        return True
+
+    def _obter_indice(self, vertice):
+        return self.tabela.indice(vertice)
+
+    def _adicionar(self, u, v):
+        if self._compartilhadas is not None:
+            self._copiar_linhas(u, v)
+        # Pode adicionar aresta duplicada ou laço (loop)
+        self.lista_adj[u][v] += 1
+        if u != v:
+            self.lista_adj[v][u] += 1
+        # Um laço soma 2 ao grau do vértice
+        self._registrar_alteracao(1, (u, v), 1)
+        if self._conectividade_valida:
+            self._conectividade.unir(u, v)
+
+    def _remover(self, u, v):
+        vizinhos_u = self.lista_adj[u]
+        if v not in vizinhos_u:
+            return False
+        if vizinhos_u[v] == 1 and u != v:
+            # A última aresta entre u e v pode ter separado uma componente:
+            # o índice de conectividade é refeito na próxima consulta
+            self._conectividade_valida = False
+        if self._compartilhadas is not None:
+            self._copiar_linhas(u, v)
+        for a, b in ((u, v), (v, u)) if u != v else ((u, v),):
+            vizinhos = self.lista_adj[a]
+            vizinhos[b] -= 1
+            if not vizinhos[b]:
+                del vizinhos[b]
+        self._registrar_alteracao(-1, (u, v), -1)
         return True
 
+    def tem_aresta(self, u, v):
+        """Verifica em O(1) se existe ao menos uma aresta entre u e v."""
+        return self._obter_indice(v) in self.lista_adj[self._obter_indice(u)]
+
+    def multiplicidade(self, u, v):
+        """Número de arestas entre u e v (para u == v, o número de laços)."""
+        return self.lista_adj[self._obter_indice(u)][self._obter_indice(v)]
+
+    def vizinhos(self, vertice):
+        """Lista dos vizinhos distintos de um vértice."""
+        rotulos = self.vertices
+        return [rotulos[j] for j in self.lista_adj[self._obter_indice(vertice)]]
+
+    # Snapshots com cópia na escrita, vértice a vértice
+    def _copiar_linhas(self, *indices):
+        """Antes de alterar uma lista ainda compartilhada com um snapshot, troca-a por uma cópia."""
+        compartilhadas = self._compartilhadas
+        for i in indices:
+            if compartilhadas[i]:
+                self.lista_adj[i] = Counter(self.lista_adj[i])
+                compartilhadas[i] = 0
+
+    def snapshot(self):
+        """
+        Vista imutável do grafo neste momento, que pode ser lida por outras
+        threads enquanto este grafo continua sendo alterado. Os Counters de
+        vizinhos são compartilhados: criar o snapshot copia só a lista de
+        referências (O(V)) e cada alteração posterior copia apenas os
+        vértices que muda, na primeira vez em que os muda.
+        """
+        copia = _Instantaneo.criar(GrafoEsparsoInstantaneo, self)
+        copia.lista_adj = list(self.lista_adj)
+        copia._conectividade = None
+        copia._conectividade_valida = False
+        self._compartilhadas = bytearray(b'\x01') * len(self.vertices)
+        return copia
+
+    # Índice de conectividade: uma busca-união atualizada a cada inserção e
+    # refeita (em O(V + E), só quando consultada) depois de uma remoção.
+    def ativar_indice_conectividade(self):
+        """Passa a manter o índice usado por mesma_componente() e numero_de_componentes()."""
+        if self._conectividade is None:
+            self._conectividade = UniaoBusca(0)
+            self._conectividade_valida = False
+
+    def desativar_indice_conectividade(self):
+        self._conectividade = None
+        self._conectividade_valida = False
+
+    def _indice_conectividade(self):
+        if not self._conectividade_valida:
+            indice = UniaoBusca(len(self.vertices))
+            for i, vizinhos in enumerate(self.lista_adj):
+                for j in vizinhos:
+                    if i < j:
+                        indice.unir(i, j)
+            self._conectividade = indice
+            self._conectividade_valida = True
+        return self._conectividade
+
+    def mesma_componente(self, u, v):
+        if self._conectividade is None:
+            return super().mesma_componente(u, v)
+        indice = self._indice_conectividade()
+        return indice.buscar(self._obter_indice(u)) == indice.buscar(self._obter_indice(v))
+
+    def numero_de_componentes(self):
+        if self._conectividade is None:
+            return super().numero_de_componentes()
+        return self._indice_conectividade().componentes
+
     # (ii) Adição de arestas
     def adicionar_aresta(self, u, v):
         try:
-            self._validar_vertice(u)
-            self._validar_vertice(v)
-
-            # Pode adicionar aresta duplicada ou laço (loop)
-            self.lista_adj[u].append(v)
-            self.lista_adj[v].append(u)
- 
-            print(f"Aresta adicionada entre {u} e {v}")
+            self._adicionar(self._obter_indice(u), self._obter_indice(v))
+            log.debug("Aresta adicionada entre %s e %s.", u, v)
         except ValueError as e:
-            print(f"Erro ao adicionar aresta: {e}")
+            log.error("Erro ao adicionar aresta: %s", e)
 
 
     # (v) Remoção de arestas
     def remover_aresta(self, u, v, peso=None):
         """
-        Se existir mais de uma, remove a primeira aresta entre os vértices u e v.
+        Se existir mais de uma, remove uma das arestas entre os vértices u e v.
         """
         try:
-            self._validar_vertice(u)
-            self._validar_vertice(v)
-
-            for index, ver in enumerate(self.lista_adj[u]):
-                if v == ver:
-                    del self.lista_adj[u][index]
-                    print(f"Aresta removida entre {u} e {v}.")
-                    break
+            if self._remover(self._obter_indice(u), self._obter_indice(v)):
+                log.debug("Aresta removida entre %s e %s.", u, v)
             else:
-                print(f"Aresta entre {u} e {v} não existe.")
-
-            for index, ver in enumerate(self.lista_adj[v]):
-                if u == ver:
-                    del self.lista_adj[v][index]
-                    print(f"Aresta removida entre {v} e {u}.")
-                    break
-            else:
-                print(f"Aresta entre {u} e {v} não existe.")
+                log.warning("Aresta entre %s e %s não existe.", u, v)
 
         except ValueError as e:
-            print(f"Erro ao remover aresta: {e}")
+            log.error("Erro ao remover aresta: %s", e)
 
 
     def imprimir(self):
@@ -415,22 +1620,26 @@ class GrafoEsparso(Grafo):
         if not self.lista_adj:
             print("{}")
             return
-        for vertice, vizinhos in self.lista_adj.items():
+        rotulos = self.vertices
+        for i, vizinhos in enumerate(self.lista_adj):
             # Junta a lista de vizinhos em uma string para impressão
-            saida = [vizinho for vizinho in vizinhos]             
-            print(f"  {vertice} -> [ {saida} ]")
+            saida = [rotulos[j] for j in vizinhos.elements()]
+            print(f"  {rotulos[i]} -> [ {saida} ]")
         print()
 
     #Atividade 1
     def is_simples(self):
-        # Verifica se há laços (loops) na lista de adjacências
-        for vertice, vizinhos in self.lista_adj.items():
-            if vertice in vizinhos:
-                return False
-        # Verifica se há arestas duplicadas
-        for vertice, vizinhos in self.lista_adj.items():
-            if len(vizinhos) != len(set(vizinhos)):
+        return self._memorizado('is_simples', self._calcular_is_simples)
+
+    def _calcular_is_simples(self):
+        for i, vizinhos in enumerate(self.lista_adj):
+            # Verifica se há laços (loops)
+            if i in vizinhos:
                 return False
+            # Verifica se há arestas duplicadas
+            for quantidade in vizinhos.values():
+                if quantidade > 1:
+                    return False
         # Se não houver laços e arestas duplicadas, o grafo é simples
         return True
 
@@ -448,73 +1657,615 @@ class GrafoEsparso(Grafo):
     
     #Atividade 2
     def get_vertices(self):
-        return list(self.lista_adj.keys())
+        return list(self.vertices)
     
     def get_arestas(self):
+        # Cada aresta é listada a partir do extremo de menor índice, uma vez
+        # por ocorrência (arestas múltiplas se repetem)
         arestas = []
-        for vertice, vizinhos in self.lista_adj.items():
-            for vizinho in vizinhos:
-                if (vizinho, vertice) not in arestas:
-                    arestas.append((vertice, vizinho))
+        rotulos = self.vertices
+        for i, vizinhos in enumerate(self.lista_adj):
+            for j, quantidade in vizinhos.items():
+                if i <= j:
+                    arestas.extend([(rotulos[i], rotulos[j])] * quantidade)
         return arestas
-    
-    def is_subgrafo(self, outro_grafo):
-        if not isinstance(outro_grafo, Grafo):
-            raise TypeError("O grafo fornecido deve ser uma instância de Grafo.")
 
-        # Verifica se todos os vértices do grafo atual estão no outro grafo
-        for vertice in self.get_vertices():
-            if vertice not in outro_grafo.get_vertices():
-                return False
+    def _pares_de_arestas(self):
+        for i, vizinhos in enumerate(self.lista_adj):
+            for j, quantidade in vizinhos.items():
+                if i <= j:
+                    yield i, j, quantidade
 
-        #Verifica se todas as arestas do grafo atual estão no outro grafo
-        for aresta in self.get_arestas():
-            if aresta not in outro_grafo.get_arestas():
-                return False
-            
-        #Compara se as arestas aparecem na mesma quantidade em ambos os grafos
-        for aresta in self.get_arestas():
-            if self.get_arestas().count(aresta) != outro_grafo.get_arestas().count(aresta):
-                return False
+    def _multiplicidade(self, i, j):
+        return self.lista_adj[i][j]
 
-        # Se todas as arestas e vértices estão presentes, é um subgrafo
-        return True
+    def _estrutura_adjacencia(self):
+        # A lista de adjacências já está no formato do motor de isomorfismo
+        return list(self.vertices), list(self.lista_adj)
 
-    def is_subgrafo_gerador(self, outro_grafo):
-        if not isinstance(outro_grafo, Grafo):
-            raise TypeError("O grafo fornecido deve ser uma instância de Grafo.")
+    def _funcao_vizinhos(self):
+        return self.lista_adj.__getitem__
 
-        if self.is_subgrafo(outro_grafo):
-            if (all(vertice in self.get_vertices() for vertice in outro_grafo.get_vertices())):
-                return True
-            else:
-                return False
+
+class GrafoEsparsoCSR(Grafo):
+    """
+    Implementa as operações básicas de um grafo não orientado usando o
+    formato CSR (compressed sparse row): um vetor de deslocamentos
+    (offsets) e um vetor contíguo com os vizinhos de todos os vértices.
+
+    Os vizinhos do vértice de índice i ficam em
+    vizinhos[offsets[i]:offsets[i + 1]]. Inserções e remoções são
+    acumuladas em buffers e aplicadas de uma só vez na próxima consulta.
+    """
+    # (i) Definição do grafo
+    def __init__(self, num_vertices=None, labels=None):
+
+        if labels:
+            self.tabela = TabelaDeRotulos(labels)
+        elif num_vertices:
+            self.tabela = TabelaDeRotulos(str(i) for i in range(num_vertices))
         else:
+            print("Erro: Forneça 'num_vertices' ou uma lista de 'labels'.")
+            sys.exit(1)
+        self.vertices = self.tabela.rotulos
+        self.mapa_labels = self.tabela.indices
+
+        # offsets tem n + 1 posições; vizinhos guarda os índices dos vizinhos.
+        # Assim como na lista de adjacências, cada aresta aparece duas vezes
+        # (e um laço aparece duas vezes na linha do próprio vértice).
+        self.offsets = array('q', bytes(8 * (len(self.vertices) + 1)))
+        self.vizinhos = array('q')
+
+        # Alterações pendentes, aplicadas por _compactar()
+        self._pendentes_u = array('q')
+        self._pendentes_v = array('q')
+        self._remocoes_pendentes = Counter()
+        # Multiconjunto das inserções pendentes por par (menor, maior), para
+        # _remover consultar em O(1); montado sob demanda e descartado quando
+        # adicionar_arestas acrescenta um lote
+        self._pares_pendentes = None
+        self._iniciar_invariantes(len(self.vertices))
+
+    @classmethod
+    def de_grafo(cls, grafo):
+        """Constrói um GrafoEsparsoCSR com os mesmos vértices e arestas de outro grafo."""
+        novo = cls(labels=list(grafo.get_vertices()))
+        novo.adicionar_arestas(grafo.get_arestas())
+        novo._compactar()
+        return novo
+
+    def _para_csr(self):
+        self._compactar()
+        return list(self.vertices), self.offsets, self.vizinhos
+
+    @classmethod
+    def carregar(cls, caminho, mmap=True):
+        """
+        Lê um grafo gravado por salvar(). Com mmap=True os vetores offsets e
+        vizinhos apontam direto para o arquivo mapeado em memória: abrir o
+        grafo não copia as arestas e processos diferentes compartilham as
+        mesmas páginas. Alterações posteriores geram vetores novos na memória.
+        """
+        dados = ler_binario(caminho, usar_mmap=mmap)
+        grafo = cls(labels=dados['rotulos'])
+        grafo.offsets, grafo.vizinhos = dados['offsets'], dados['vizinhos']
+        grafo._mapa = dados['mapa']
+
+        offsets, graus = grafo.offsets, grafo._graus
+        for i in range(len(graus)):
+            graus[i] = offsets[i + 1] - offsets[i]
+        grafo._num_arestas = len(grafo.vizinhos) // 2
+        return grafo
+
+    def _compactar(self):
+        """Aplica as inserções e remoções pendentes reconstruindo o CSR em O(V + E)."""
+        if not self._pendentes_u and not self._remocoes_pendentes:
+            return
+
+        n = len(self.vertices)
+        offsets, vizinhos = self.offsets, self.vizinhos
+        pend_u, pend_v = self._pendentes_u, self._pendentes_v
+        remocoes = self._remocoes_pendentes
+
+        # Passo 1: novas linhas = linhas antigas + inserções pendentes
+        graus = array('q', bytes(8 * n))
+        for i in range(n):
+            graus[i] = offsets[i + 1] - offsets[i]
+        for k in range(len(pend_u)):
+            graus[pend_u[k]] += 1
+            graus[pend_v[k]] += 1
+
+        novos_offsets = array('q', bytes(8 * (n + 1)))
+        for i in range(n):
+            novos_offsets[i + 1] = novos_offsets[i] + graus[i]
+
+        novos_vizinhos = array('q', bytes(8 * novos_offsets[n]))
+        posicao = array('q', novos_offsets[:n])
+        for i in range(n):
+            for k in range(offsets[i], offsets[i + 1]):
+                novos_vizinhos[posicao[i]] = vizinhos[k]
+                posicao[i] += 1
+        for k in range(len(pend_u)):
+            u, v = pend_u[k], pend_v[k]
+            novos_vizinhos[posicao[u]] = v
+            posicao[u] += 1
+            novos_vizinhos[posicao[v]] = u
+            posicao[v] += 1
+
+        # Passo 2: aplica as remoções descartando as ocorrências marcadas
+        if remocoes:
+            restantes = {}
+            for (u, v), quantidade in remocoes.items():
+                restantes[(u, v)] = restantes.get((u, v), 0) + quantidade
+                restantes[(v, u)] = restantes.get((v, u), 0) + quantidade
+            compactados = array('q')
+            inicio = 0
+            for i in range(n):
+                fim = novos_offsets[i + 1]
+                for k in range(inicio, fim):
+                    j = novos_vizinhos[k]
+                    if restantes.get((i, j), 0) > 0:
+                        restantes[(i, j)] -= 1
+                        continue
+                    compactados.append(j)
+                inicio = fim
+                novos_offsets[i + 1] = len(compactados)
+            novos_vizinhos = compactados
+
+        self.offsets = novos_offsets
+        self.vizinhos = novos_vizinhos
+        self._pendentes_u = array('q')
+        self._pendentes_v = array('q')
+        self._remocoes_pendentes = Counter()
+        self._pares_pendentes = None
+
+    def numero_de_vertices(self):
+        # Retorna o número total de vértices no grafo.
+        return len(self.vertices)
+
+    def numero_de_arestas(self):
+        # Retorna o número total de arestas no grafo, já contando as
+        # alterações pendentes.
+        return self._num_arestas
+
+    def sequencia_de_graus(self):
+        # Retorna uma lista com os graus de todos os vértices.
+        return self._memorizado('sequencia_de_graus', lambda: sorted(self._graus))
+
+    def _obter_indice(self, vertice):
+        """Método auxiliar que converte o rótulo de um vértice no seu índice."""
+        return self.tabela.indice(vertice)
+
+    def _funcao_vizinhos(self):
+        self._compactar()
+        offsets, vizinhos = self.offsets, self.vizinhos
+        return lambda i: vizinhos[offsets[i]:offsets[i + 1]]
+
+    def _contar_ocorrencias(self, idx_u, idx_v):
+        """Conta quantas vezes idx_v aparece na linha de idx_u, já com as alterações pendentes."""
+        offsets = self.offsets
+        total = 0
+        for k in range(offsets[idx_u], offsets[idx_u + 1]):
+            if self.vizinhos[k] == idx_v:
+                total += 1
+        if idx_u == idx_v:
+            # Cada laço ocupa duas posições na linha do próprio vértice
+            total //= 2
+        if self._pendentes_u:
+            if self._pares_pendentes is None:
+                self._pares_pendentes = Counter(
+                    (u, v) if u <= v else (v, u) for u, v in zip(self._pendentes_u, self._pendentes_v))
+            total += self._pares_pendentes[(idx_u, idx_v) if idx_u <= idx_v else (idx_v, idx_u)]
+        total -= self._remocoes_pendentes[(idx_u, idx_v)]
+        if idx_u != idx_v:
+            total -= self._remocoes_pendentes[(idx_v, idx_u)]
+        return total
+
+    def _pares_de_arestas(self):
+        # Contagem linha a linha; laços ocupam duas posições na própria linha
+        self._compactar()
+        offsets, vizinhos = self.offsets, self.vizinhos
+        for i in range(len(self.vertices)):
+            for j, quantidade in Counter(vizinhos[offsets[i]:offsets[i + 1]]).items():
+                if i < j:
+                    yield i, j, quantidade
+                elif i == j:
+                    yield i, i, quantidade // 2
+
+    def _multiplicidade(self, i, j):
+        return self._contar_ocorrencias(i, j)
+
+    def _adicionar(self, idx_u, idx_v):
+        # Pode adicionar aresta duplicada ou laço (loop)
+        self._pendentes_u.append(idx_u)
+        self._pendentes_v.append(idx_v)
+        if self._pares_pendentes is not None:
+            self._pares_pendentes[(idx_u, idx_v) if idx_u <= idx_v else (idx_v, idx_u)] += 1
+        self._registrar_alteracao(1, (idx_u, idx_v), 1)
+
+    def _remover(self, idx_u, idx_v):
+        if self._contar_ocorrencias(idx_u, idx_v) <= 0:
             return False
+        self._remocoes_pendentes[(idx_u, idx_v)] += 1
+        self._registrar_alteracao(-1, (idx_u, idx_v), -1)
+        return True
 
-    def is_subgrafo_induzido(self, outro_grafo):
-        if not isinstance(outro_grafo, Grafo):
-            raise TypeError("O grafo fornecido deve ser uma instância de Grafo.")
+    def adicionar_arestas(self, arestas):
+        """
+        Adiciona várias arestas de uma vez, sem imprimir nada.
+        Os índices são acumulados em dois arrays contíguos e o CSR é
+        reconstruído uma única vez, na próxima consulta.
+        Retorna a lista de erros no formato (aresta, mensagem).
+        """
+        erros = []
+        mapa = self.mapa_labels
+        novos_u = array('q')
+        novos_v = array('q')
+        for aresta in arestas:
+            try:
+                u, v = aresta
+                idx_u, idx_v = mapa[u], mapa[v]
+            except KeyError as e:
+                erros.append((aresta, f"Vértice '{e.args[0]}' não existe no grafo."))
+                continue
+            except (ValueError, TypeError) as e:
+                erros.append((aresta, str(e)))
+                continue
+            novos_u.append(idx_u)
+            novos_v.append(idx_v)
+        self._pendentes_u.extend(novos_u)
+        self._pendentes_v.extend(novos_v)
+        self._pares_pendentes = None
+
+        # Atualiza os invariantes de uma só vez para o lote inteiro
+        graus = self._graus
+        for k in range(len(novos_u)):
+            graus[novos_u[k]] += 1
+            graus[novos_v[k]] += 1
+        self._num_arestas += len(novos_u)
+        self._versao += 1
+        contadores['arestas_adicionadas'] += len(novos_u)
+        return erros
+
+    # (ii) Adição de arestas
+    def adicionar_aresta(self, u, v):
+        try:
+            self._adicionar(self._obter_indice(u), self._obter_indice(v))
+            log.debug("Aresta adicionada entre %s e %s.", u, v)
+        except ValueError as e:
+            log.error("Erro ao adicionar aresta: %s", e)
+
+    # (v) Remoção de arestas
+    def remover_aresta(self, u, v):
+        """
+        Se existir mais de uma, remove uma das arestas entre os vértices u e v.
+        """
+        try:
+            if not self._remover(self._obter_indice(u), self._obter_indice(v)):
+                log.warning("Aresta entre %s e %s não existe.", u, v)
+                return
+            log.debug("Aresta removida entre %s e %s.", u, v)
+        except ValueError as e:
+            log.error("Erro ao remover aresta: %s", e)
 
-        if self.is_subgrafo(outro_grafo):
-            lista_arestas = []
-            #Filtra apenas as arestas que conectam os vértices do subgrafo
-            for aresta in outro_grafo.get_arestas():
-                if all(v in self.get_vertices() for v in aresta):
-                    lista_arestas.append(aresta)
+    def imprimir(self):
+        """Imprime os vizinhos de cada vértice de forma legível."""
+        self._compactar()
+        print("\nLista de Adjacências (CSR):")
+        for i, vertice in enumerate(self.vertices):
+            saida = [self.vertices[j] for j in self.vizinhos[self.offsets[i]:self.offsets[i + 1]]]
+            print(f"  {vertice} -> [ {saida} ]")
+        print()
 
-            for aresta in self.get_arestas():
-                if aresta not in lista_arestas:
+    #Atividade 1
+    def is_simples(self):
+        return self._memorizado('is_simples', self._calcular_is_simples)
+
+    def _calcular_is_simples(self):
+        # Uma única varredura: marca[j] guarda a última linha em que j apareceu,
+        # então um vizinho repetido na mesma linha indica aresta múltipla.
+        self._compactar()
+        n = len(self.vertices)
+        offsets, vizinhos = self.offsets, self.vizinhos
+        marca = array('q', [-1]) * n
+        for i in range(n):
+            for k in range(offsets[i], offsets[i + 1]):
+                j = vizinhos[k]
+                # Laço ou aresta duplicada
+                if j == i or marca[j] == i:
                     return False
-                
-            for aresta in outro_grafo.get_arestas():
-                if aresta not in self.get_arestas():
-                    return False   
+                marca[j] = i
+        return True
+
+    def is_nulo(self):
+        if self.numero_de_arestas() == 0 and self.numero_de_vertices() > 0:
+            return True
+        return False
+
+    def is_completo(self):
+        if (self.is_simples() and self.numero_de_arestas() == (self.numero_de_vertices() *
+                                         (self.numero_de_vertices() - 1)) // 2):
             return True
+        return False
+
+    #Atividade 2
+    def get_vertices(self):
+        return list(self.vertices)
+
+    def get_arestas(self):
+        # Cada aresta aparece nas linhas dos dois extremos; guarda apenas a
+        # ocorrência em que i < j. Laços aparecem duas vezes na mesma linha.
+        self._compactar()
+        arestas = []
+        offsets, vizinhos, labels = self.offsets, self.vizinhos, self.vertices
+        for i in range(len(labels)):
+            lacos = 0
+            for k in range(offsets[i], offsets[i + 1]):
+                j = vizinhos[k]
+                if i < j:
+                    arestas.append((labels[i], labels[j]))
+                elif i == j:
+                    lacos += 1
+                    if lacos % 2 == 0:
+                        arestas.append((labels[i], labels[i]))
+        return arestas
+
+
+class GrafoAdaptativo(Grafo):
+    """
+    Grafo que escolhe sozinho a representação: começa como GrafoEsparso e
+    passa para GrafoDenso (matriz de bits) quando a densidade
+    arestas / (n * (n - 1) / 2) supera 'densidade_para_denso', voltando para
+    a lista de adjacências quando cai abaixo de 'densidade_para_esparso'.
+    A distância entre os dois limites (histerese) evita migrações de ida e
+    volta. A semântica é sempre a da lista de adjacências: laços e arestas
+    paralelas são aceitos e, enquanto existirem, o grafo não vai para a matriz.
+    """
+
+    def __init__(self, num_vertices=None, labels=None, densidade_para_denso=0.25,
+                 densidade_para_esparso=0.1):
+        if not 0 <= densidade_para_esparso < densidade_para_denso:
+            raise ValueError("É preciso que 0 <= densidade_para_esparso < densidade_para_denso.")
+        self.densidade_para_denso = densidade_para_denso
+        self.densidade_para_esparso = densidade_para_esparso
+        self._grafo = GrafoEsparso(num_vertices=num_vertices,
+                                   labels=list(labels) if labels else None)
+        self._denso = False
+        # As duas representações numeram os vértices na ordem da tabela,
+        # então os índices sobrevivem às migrações
+        self.tabela = self._grafo.tabela
+        # Laços e cópias extras de arestas paralelas: enquanto houver algum,
+        # a matriz de bits não consegue representar o grafo
+        self._excessos = 0
+
+    @property
+    def representacao(self):
+        """Nome da classe usada no momento para guardar o grafo."""
+        return type(self._grafo).__name__
+
+    def densidade(self):
+        n = self._grafo.numero_de_vertices()
+        pares = n * (n - 1) // 2
+        return self._grafo.numero_de_arestas() / pares if pares else 0.0
+
+    def _migrar(self, classe):
+        anterior = self._grafo
+        novo = classe(labels=list(anterior.get_vertices()))
+        novo.adicionar_arestas(anterior.get_arestas())
+        self._grafo = novo
+        self._denso = classe is GrafoDenso
+        self.tabela = novo.tabela
+        contadores['migracoes'] += 1
+        log.debug("GrafoAdaptativo migrou de %s para %s (densidade %.3f).",
+                  type(anterior).__name__, classe.__name__, self.densidade())
+
+    def _ajustar(self):
+        densidade = self.densidade()
+        if self._denso:
+            if densidade < self.densidade_para_esparso:
+                self._migrar(GrafoEsparso)
+        elif densidade > self.densidade_para_denso and not self._excessos:
+            self._migrar(GrafoDenso)
+
+    # Primitivas usadas pelas operações em lote herdadas de Grafo
+    def _obter_indice(self, vertice):
+        return self.tabela.indice(vertice)
+
+    def _adicionar(self, u, v):
+        if self._denso:
+            if u == v or self._grafo._tem_bit(u, v):
+                # Laços e arestas paralelas só existem na lista de adjacências
+                self._migrar(GrafoEsparso)
+            else:
+                self._grafo._adicionar(u, v)
+                self._ajustar()
+                return
+        if u == v or v in self._grafo.lista_adj[u]:
+            self._excessos += 1
+        self._grafo._adicionar(u, v)
+        self._ajustar()
+
+    def _remover(self, u, v):
+        if self._denso:
+            removida = self._grafo._remover(u, v)
         else:
-            return False
+            extra = u == v or self._grafo.lista_adj[u][v] > 1
+            removida = self._grafo._remover(u, v)
+            if removida and extra:
+                self._excessos -= 1
+        if removida:
+            self._ajustar()
+        return removida
+
+    def _memorizado(self, nome, calcular):
+        # Os valores memorizados ficam na representação atual e somem com ela
+        return self._grafo._memorizado(nome, calcular)
+
+    def _pares_de_arestas(self):
+        return self._grafo._pares_de_arestas()
+
+    def _multiplicidade(self, i, j):
+        return self._grafo._multiplicidade(i, j)
+
+    def _funcao_vizinhos(self):
+        return self._grafo._funcao_vizinhos()
+
+    def _percorrer_largura(self, origem, visitados):
+        return self._grafo._percorrer_largura(origem, visitados)
+
+    def _percorrer_profundidade(self, origem, visitados):
+        return self._grafo._percorrer_profundidade(origem, visitados)
+
+    def adicionar_aresta(self, u, v):
+        try:
+            self._adicionar(self._obter_indice(u), self._obter_indice(v))
+            log.debug("Aresta adicionada entre %s e %s.", u, v)
+        except ValueError as e:
+            log.error("Erro ao adicionar aresta: %s", e)
+
+    def remover_aresta(self, u, v):
+        """
+        Se existir mais de uma, remove uma das arestas entre os vértices u e v.
+        """
+        try:
+            if not self._remover(self._obter_indice(u), self._obter_indice(v)):
+                log.warning("Aresta entre %s e %s não existe.", u, v)
+                return
+            log.debug("Aresta removida entre %s e %s.", u, v)
+        except ValueError as e:
+            log.error("Erro ao remover aresta: %s", e)
+
+    def salvar(self, caminho):
+        """Grava o grafo no formato binário da representação atual."""
+        self._grafo.salvar(caminho)
+
+    def snapshot(self):
+        """Snapshot imutável da representação atual (ver GrafoEsparso.snapshot)."""
+        return self._grafo.snapshot()
+
+    def numero_de_vertices(self):
+        return self._grafo.numero_de_vertices()
+
+    def numero_de_arestas(self):
+        return self._grafo.numero_de_arestas()
+
+    def sequencia_de_graus(self):
+        return self._grafo.sequencia_de_graus()
+
+    def imprimir(self):
+        self._grafo.imprimir()
+
+    def is_simples(self):
+        return self._grafo.is_simples()
+
+    def is_nulo(self):
+        return self._grafo.is_nulo()
+
+    def is_completo(self):
+        return self._grafo.is_completo()
+
+    def get_vertices(self):
+        return self._grafo.get_vertices()
+
+    def get_arestas(self):
+        return self._grafo.get_arestas()
+
+
+class _Instantaneo:
+    """
+    Base das vistas imutáveis devolvidas por snapshot(): todas as consultas
+    funcionam normalmente e qualquer alteração levanta TypeError.
+    """
+
+    @staticmethod
+    def criar(classe, grafo):
+        """Instância de 'classe' com os atributos de 'grafo'; as estruturas mutáveis são trocadas por quem chama."""
+        copia = object.__new__(classe)
+        copia.__dict__.update(grafo.__dict__)
+        copia._graus = array('q', grafo._graus)
+        copia._cache = dict(grafo._cache)
+        copia._compartilhadas = None
+        return copia
+
+    def _adicionar(self, *args):
+        raise TypeError("Um snapshot não pode ser alterado.")
+
+    _remover = _adicionar
+    adicionar_aresta = _adicionar
+    remover_aresta = _adicionar
+    adicionar_arestas = _adicionar
+    remover_arestas = _adicionar
+
+    def snapshot(self):
+        return self
+
+
+class GrafoEsparsoInstantaneo(_Instantaneo, GrafoEsparso):
+    """Snapshot imutável de um GrafoEsparso."""
+
+
+class GrafoDensoInstantaneo(_Instantaneo, GrafoDenso):
+    """Snapshot imutável de um GrafoDenso."""
+
+
+class GrafoDensoNumPyInstantaneo(_Instantaneo, GrafoDensoNumPy):
+    """Snapshot imutável de um GrafoDensoNumPy."""
+
+
+def _hash_canonico(grafo):
+    return grafo.hash_canonico()
+
+
+class CatalogoDeGrafos:
+    """
+    Agrupa grafos em classes de isomorfismo usando o hash canônico: cada
+    grafo é comparado apenas pelo seu hash, sem chamadas a is_isomorfo.
+    """
+
+    def __init__(self):
+        # hash canônico -> grafos da classe
+        self.baldes = {}
+
+    def adicionar(self, grafo, chave=None):
+        """
+        Adiciona um grafo ao catálogo e retorna o seu hash canônico.
+        'chave' permite informar um hash já calculado.
+        """
+        if chave is None:
+            chave = grafo.hash_canonico()
+        self.baldes.setdefault(chave, []).append(grafo)
+        return chave
+
+    def adicionar_varios(self, grafos, workers=1):
+        """
+        Adiciona vários grafos em uma única passada. Com workers > 1 os
+        hashes são calculados em paralelo por um pool de processos.
+        """
+        grafos = list(grafos)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                tamanho_lote = max(1, len(grafos) // (4 * workers))
+                chaves = list(executor.map(_hash_canonico, grafos, chunksize=tamanho_lote))
+        else:
+            chaves = [grafo.hash_canonico() for grafo in grafos]
+        for grafo, chave in zip(grafos, chaves):
+            self.adicionar(grafo, chave)
+        return chaves
+
+    def contem_isomorfo(self, grafo):
+        """Verifica se o catálogo já tem um grafo isomorfo a 'grafo'."""
+        return grafo.hash_canonico() in self.baldes
+
+    def classes(self):
+        """Lista das classes de isomorfismo, cada uma como lista de grafos."""
+        return list(self.baldes.values())
 
+    def representantes(self):
+        """Um grafo de cada classe (o primeiro adicionado)."""
+        return [grafos[0] for grafos in self.baldes.values()]
 
+    def __len__(self):
+        return len(self.baldes)
 
 
 if __name__ == "__main__":